@@ -36,6 +36,10 @@ class ShiftableZoomingComponent(SessionZoomingComponent):
 
         return
 
+    def _update_block(self, x, y):
+        if not self._ignore_buttons:
+            super(ShiftableZoomingComponent, self)._update_block(x, y)
+
     def _stop_value(self, value, sender):
         if not value in range(128):
             raise AssertionError
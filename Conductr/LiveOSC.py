@@ -153,6 +153,7 @@ class LiveOSC:
         if self.oscEndpoint:
             self.positions()
             #self.songtime_change()
+            self.oscEndpoint.flush()
             
         # END OSC LISTENER SETUP
         ######################################################
@@ -239,7 +240,7 @@ class LiveOSC:
                             else:
                                 pos = round((clip.playing_position-clip.loop_start) / (clip.length), 3)
                             
-                            self.oscEndpoint.send('/clip/playing_position',(i, ps, pos))
+                            self.oscEndpoint.queue('/clip/playing_position', (i, ps, pos), i)
                         else:
                             pass
                     else:
@@ -256,8 +257,8 @@ class LiveOSC:
         
         for track in range(0, blocksize):
             block.extend([str(tracks[trackOffset+track].name)])                            
-        self.oscEndpoint.send("/live/name/trackblock", block)
-        self.oscEndpoint.send("/live/trackblock/refresh", block)
+        self.oscEndpoint.queue("/live/name/trackblock", block)
+        self.oscEndpoint.queue("/live/trackblock/refresh", block)
 
     def sendDeviceIds(self):
         block=[]
@@ -289,6 +290,7 @@ class LiveOSC:
         
         self.song().remove_tracks_listener(self.refresh_state)
         
+        self.oscEndpoint.flush(rateLimited=False)
         self.oscEndpoint.send('/remix/oscserver/shutdown', 1)
         self.oscEndpoint.shutdown()
             
@@ -905,7 +907,7 @@ class LiveOSC:
                 if send > 0:
                     self._send_pos[tid] -= 1
                     
-                self.oscEndpoint.send('/live/clip/position', (tid, cid, clip.playing_position, clip.length, clip.loop_start, clip.loop_end))
+                self.oscEndpoint.queue('/live/clip/position', (tid, cid, clip.playing_position, clip.length, clip.loop_start, clip.loop_end), (tid, cid))
     
     def slot_changestate(self, slot, tid, cid):
         tmptrack = LiveUtils.getTrack(tid)
@@ -967,27 +969,27 @@ class LiveOSC:
         types = { "panning": "pan", "volume": "volume", "crossfader": "crossfader" }
         
         if r == 2:
-            self.oscEndpoint.send('/live/master/' + types[type], (float(val)))
+            self.oscEndpoint.queue('/live/master/' + types[type], (float(val)))
         elif r == 1:
-            self.oscEndpoint.send('/live/return/' + types[type], (tid, float(val)))
+            self.oscEndpoint.queue('/live/return/' + types[type], (tid, float(val)), tid)
         else:
-            self.oscEndpoint.send('/live/' + types[type], (tid, float(val)))        
+            self.oscEndpoint.queue('/live/' + types[type], (tid, float(val)), tid)        
         
     def mixert_changestate(self, type, tid, track, r = 0):
         val = eval("track." + type)
         
         if r == 1:
-            self.oscEndpoint.send('/live/return/' + type, (tid, int(val)))
+            self.oscEndpoint.queue('/live/return/' + type, (tid, int(val)), tid)
         else:
-            self.oscEndpoint.send('/live/' + type, (tid, int(val)))        
+            self.oscEndpoint.queue('/live/' + type, (tid, int(val)), tid)        
     
     def send_changestate(self, tid, track, sid, send, r = 0):
         val = send.value
         
         if r == 1:
-            self.oscEndpoint.send('/live/return/send', (tid, sid, float(val)))   
+            self.oscEndpoint.queue('/live/return/send', (tid, sid, float(val)), (tid, sid))
         else:
-            self.oscEndpoint.send('/live/send', (tid, sid, float(val)))   
+            self.oscEndpoint.queue('/live/send', (tid, sid, float(val)), (tid, sid))   
 
 
     # Track name changestate
@@ -998,7 +1000,7 @@ class LiveOSC:
                 col = track.color
             except:
                 pass
-            self.oscEndpoint.send('/live/name/return', (tid, str(track.name), col))
+            self.oscEndpoint.queue('/live/name/return', (tid, str(track.name), col), tid)
         else:
             col = 0
             try:
@@ -1006,7 +1008,7 @@ class LiveOSC:
             except:
                 pass
             ndevices=len(track.devices)
-            self.oscEndpoint.send('/live/name/track', (tid, str(track.name), col))
+            self.oscEndpoint.queue('/live/name/track', (tid, str(track.name), col), tid)
             self.trBlock(0, len(LiveUtils.getTracks()))
             
     # Meter Changestate
@@ -1014,21 +1016,21 @@ class LiveOSC:
         if r == 2:
             if self.check_md(2):
                 if lr == 0:
-                    self.oscEndpoint.send('/live/master/meter', (0, float(track.output_meter_left)))
+                    self.oscEndpoint.queue('/live/master/meter', (0, float(track.output_meter_left)), 0)
                 else:
-                    self.oscEndpoint.send('/live/master/meter', (1, float(track.output_meter_right)))
+                    self.oscEndpoint.queue('/live/master/meter', (1, float(track.output_meter_right)), 1)
         elif r == 1:
             if self.check_md(3):
                 if lr == 0:
-                    self.oscEndpoint.send('/live/return/meter', (tid, 0, float(track.output_meter_left)))
+                    self.oscEndpoint.queue('/live/return/meter', (tid, 0, float(track.output_meter_left)), (tid, 0))
                 else:
-                    self.oscEndpoint.send('/live/return/meter', (tid, 1, float(track.output_meter_right)))        
+                    self.oscEndpoint.queue('/live/return/meter', (tid, 1, float(track.output_meter_right)), (tid, 1))        
         else:
             if self.check_md(4):
                 if lr == 0:
-                    self.oscEndpoint.send('/live/track/meter', (tid, 0, float(track.output_meter_left)))
+                    self.oscEndpoint.queue('/live/track/meter', (tid, 0, float(track.output_meter_left)), (tid, 0))
                 else:
-                    self.oscEndpoint.send('/live/track/meter', (tid, 1, float(track.output_meter_right)))
+                    self.oscEndpoint.queue('/live/track/meter', (tid, 1, float(track.output_meter_right)), (tid, 1))
     
     def check_md(self, param):
         devices = self.song().master_track.devices
@@ -1140,11 +1142,11 @@ class LiveOSC:
             
     def param_changestate(self, param, tid, did, pid, type):
         if type == 2:
-            self.oscEndpoint.send('/live/master/device/param', (did, pid, param.value, str(param.name)))
+            self.oscEndpoint.queue('/live/master/device/param', (did, pid, param.value, str(param.name)), (did, pid))
         elif type == 1:
-            self.oscEndpoint.send('/live/return/device/param', (tid, did, pid, param.value, str(param.name)))
+            self.oscEndpoint.queue('/live/return/device/param', (tid, did, pid, param.value, str(param.name)), (tid, did, pid))
         else:
-            self.oscEndpoint.send('/live/device/param', (tid, did, pid, param.value, str(param.name)))
+            self.oscEndpoint.queue('/live/device/param', (tid, did, pid, param.value, str(param.name)), (tid, did, pid))
         
     def add_devicelistener(self, track, tid, type):
         cb = lambda :self.device_changestate(track, tid, type)
@@ -40,6 +40,16 @@ import time
 
 from Logger import log
 
+# Preallocated packers for the fixed size parts of messages
+INT = struct.Struct(">i")
+FLOAT = struct.Struct(">f")
+TIMESTAMP = struct.Struct("!LL")
+
+BUNDLE_HEADER = "#bundle\0"
+
+# Time tag of bundles that are to be processed immediately
+IMMEDIATELY = TIMESTAMP.pack(0, 1)
+
 def hexDump(bytes):
     """Useful utility; prints the string in hexadecimal"""
     for i in range(len(bytes)):
@@ -54,8 +64,8 @@ class OSCMessage:
     """Builds typetagged OSC messages."""
     def __init__(self, address='', msg=()):
         self.address  = address
-        self.typetags = ","
-        self.message  = ""
+        self.typetags = [","]
+        self.message  = []
 
         if type(msg) in (str, int, float):
            self.append(msg)
@@ -81,14 +91,14 @@ class OSCMessage:
         else:
             binary = OSCArgument(argument)
 
-        self.typetags = self.typetags + binary[0]
-        self.message = self.message + binary[1]
+        self.typetags.append(binary[0])
+        self.message.append(binary[1])
 
     def getBinary(self):
         """Returns the binary message (so far) with typetags."""
-        address  = OSCArgument(self.address)[1]
-        typetags = OSCArgument(self.typetags)[1]
-        return address + typetags + self.message
+        address  = OSCString(self.address)
+        typetags = OSCString("".join(self.typetags))
+        return address + typetags + "".join(self.message)
 
     def __repr__(self):
         return self.getBinary()
@@ -103,15 +113,12 @@ def abs_to_timestamp(abs):
     sec_frac = float(abs - sec_1970)
     picos = long(sec_frac * SECS_TO_PICOS)
 
-    total_picos = (abs + JAN_1970) * SECS_TO_PICOS
-    return struct.pack('!LL', sec_1900, picos)
+    return TIMESTAMP.pack(sec_1900, picos)
 
 class OSCBundle:
     """Builds OSC bundles"""
     def __init__(self, when=None):
         self.items = []
-        if when == None:
-            when = time.time()
         self.when = when
 
     def append(self, address, msg = None):
@@ -124,11 +131,26 @@ class OSCBundle:
             raise Exception('invalid type of first argument to OSCBundle.append(), need address string or OSCMessage, not ', str(type(address)))
 
     def getBinary(self):
-        retval = OSCArgument('#bundle')[1] + abs_to_timestamp(self.when)
-        for item in self.items:
-            binary = item.getBinary()
-            retval = retval + OSCArgument(len(binary))[1] + binary
-        return retval
+        return OSCBundleBinary([ item.getBinary() for item in self.items ], self.when)
+
+def OSCBundleBinary(binaries, when=None):
+    """Packs already encoded messages into a bundle.  Without a time,
+    the bundle is tagged to be processed immediately."""
+    if when == None:
+        timetag = IMMEDIATELY
+    else:
+        timetag = abs_to_timestamp(when)
+    parts = [BUNDLE_HEADER, timetag]
+    for binary in binaries:
+        parts.append(INT.pack(len(binary)))
+        parts.append(binary)
+    return "".join(parts)
+
+def OSCBundleSize(binary):
+    """Number of bytes a message takes inside a bundle."""
+    return len(binary) + INT.size
+
+BUNDLE_HEADER_SIZE = len(BUNDLE_HEADER) + TIMESTAMP.size
 
 def readString(data):
     length   = string.find(data,"\0")
@@ -176,8 +198,7 @@ def OSCBlob(next):
 
     if type(next) == type(""):
         length = len(next)
-        padded = math.ceil((len(next)) / 4.0) * 4
-        binary = struct.pack(">i%ds" % (padded), length, next)
+        binary = INT.pack(length) + next + "\0" * (-length % 4)
         tag    = 'b'
     else:
         tag    = ''
@@ -185,20 +206,23 @@ def OSCBlob(next):
     
     return (tag, binary)
 
+def OSCString(next):
+    """Null terminates a string and pads it to a multiple of 4 bytes."""
+    return next + "\0" * (4 - len(next) % 4)
+
 def OSCArgument(next):
     """Convert some Python types to their
     OSC binary representations, returning a
     (typetag, data) tuple."""
     
     if type(next) == type(""):        
-        OSCstringLength = math.ceil((len(next)+1) / 4.0) * 4
-        binary  = struct.pack(">%ds" % (OSCstringLength), next)
+        binary  = OSCString(next)
         tag = "s"
     elif type(next) == type(42.5):
-        binary  = struct.pack(">f", next)
+        binary  = FLOAT.pack(next)
         tag = "f"
     elif type(next) == type(13):
-        binary  = struct.pack(">i", next)
+        binary  = INT.pack(next)
         tag = "i"
     else:
         raise Exception("don't know how to encode " + str(next) + " as OSC argument, type=" + str(type(next)))
@@ -62,6 +62,8 @@ Based on the original RemixNet.py written by Nathan Ramella (nar@remix.net)
 """
 import sys
 import errno
+import time
+from collections import deque
 import Live
 from Logger import log
 
@@ -83,6 +85,29 @@ else:
             import socket
 
 import OSC 
+
+# Largest datagram that we fill with queued messages, chosen so that
+# bundles are not fragmented on ethernet.
+MAX_PACKET_SIZE = 1400
+
+# Number of messages that may wait for the next flush.  Beyond that,
+# the oldest queued message is dropped.
+MAX_QUEUED_MESSAGES = 1024
+
+# Families of addresses that are updated continuously, with the
+# address prefixes belonging to them and the maximum number of times
+# per second that they are sent.  Queued messages of a family wait,
+# and are coalesced, until the family may be sent again.
+ADDRESS_FAMILIES = (
+    ('meters', ('/live/track/meter', '/live/return/meter', '/live/master/meter'), 20),
+    ('positions', ('/clip/playing_position', '/live/clip/position'), 10),
+    ('names', ('/live/name/',), 5),
+)
+
+# Fraction of a family's interval that has to pass before it is sent
+# again, so that flushes on a timer of the same interval are not
+# skipped because of jitter.
+RATE_SLACK = 0.9
             
 class OSCEndpoint:
         
@@ -105,6 +130,8 @@ class OSCEndpoint:
         /remix/echo - Echos back the string argument to the peer.
         /remix/time - Returns time.time() (time in float seconds)
         /remix/set_peer - Reconfigures the peer address which we send OSC messages to
+        /remix/set_rate - Sets the maximum rate of an address family
+        /remix/stats - Returns the statistics of the output queue
         """
 
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -123,6 +150,18 @@ class OSCEndpoint:
         self.callbackManager.add('/remix/echo', self.callbackEcho)
         self.callbackManager.add('/remix/time', self.callbackEcho)
         self.callbackManager.add('/remix/set_peer', self.setPeer)
+        self.callbackManager.add('/remix/set_rate', self.callbackSetRate)
+        self.callbackManager.add('/remix/stats', self.callbackStats)
+
+        # Output queue, see queue() and flush()
+        self.queued = {}
+        self.queueOrder = deque()
+        self.families = {}
+        self.familyCache = {}
+        self.familySent = {}
+        for family, prefixes, rate in ADDRESS_FAMILIES:
+            self.setFamilyRate(family, rate, prefixes)
+        self.resetStats()
  
     def send(self, address, msg):
        
@@ -143,6 +182,125 @@ class OSCEndpoint:
     def sendMessage(self, message):
         self.socket.sendto(message.getBinary(), self.remoteAddr)
 
+    def queue(self, address, msg, key=None):
+        """
+        Queues an OSC message to be sent with the next flush().  Use
+        this instead of send() for state that changes often, like
+        meters or positions.  A queued message with the same address
+        and key is replaced, so that only the latest state is sent.
+        The key is usually a tuple of the indices that the message
+        refers to, e.g. (track, channel) for a meter.
+        """
+        id = (address, key)
+        if self.queued.has_key(id):
+            self.coalescedCount += 1
+        else:
+            if len(self.queueOrder) >= MAX_QUEUED_MESSAGES:
+                del self.queued[self.queueOrder.popleft()]
+                self.droppedCount += 1
+            self.queueOrder.append(id)
+        self.queued[id] = msg
+
+    def flush(self, rateLimited=True):
+        """
+        Sends the queued messages, except those whose address family
+        has been sent too recently.  These stay queued for a later
+        flush.  With rateLimited=False everything is sent, e.g. before
+        shutting down.  The messages are packed into as few bundles as
+        MAX_PACKET_SIZE allows.  Called on every timer tick.
+        """
+        if not self.queueOrder:
+            return
+        now = time.time()
+        ready = {}
+        held = deque()
+        binaries = []
+        for id in self.queueOrder:
+            family = self.addressFamily(id[0])
+            if not ready.has_key(family):
+                ready[family] = family == None or not rateLimited or now - self.familySent.get(family, 0) >= self.families[family][1] * RATE_SLACK
+            if ready[family]:
+                binaries.append(OSC.OSCMessage(id[0], self.queued.pop(id)).getBinary())
+            else:
+                held.append(id)
+        for family in ready.keys():
+            if ready[family] and family != None:
+                self.familySent[family] = now
+        self.queueOrder = held
+        self.sendPacked(binaries)
+
+    def sendPacked(self, binaries):
+        """
+        Sends encoded messages, as many as fit into MAX_PACKET_SIZE
+        per bundle.  A message that is alone in its packet is sent
+        without a bundle.
+        """
+        bundle = []
+        size = OSC.BUNDLE_HEADER_SIZE
+        for binary in binaries:
+            binarySize = OSC.OSCBundleSize(binary)
+            if bundle and size + binarySize > MAX_PACKET_SIZE:
+                self.sendBundle(bundle)
+                bundle = []
+                size = OSC.BUNDLE_HEADER_SIZE
+            bundle.append(binary)
+            size = size + binarySize
+        if bundle:
+            self.sendBundle(bundle)
+
+    def sendBundle(self, binaries):
+        if len(binaries) == 1:
+            packet = binaries[0]
+        else:
+            packet = OSC.OSCBundleBinary(binaries)
+        try:
+            self.socket.sendto(packet, self.remoteAddr)
+        except Exception, e:
+            self.droppedCount += len(binaries)
+            log('error sending queued messages: ' + str(e))
+        else:
+            self.sentCount += len(binaries)
+            self.packetCount += 1
+            if len(binaries) > 1:
+                self.bundleCount += 1
+
+    def addressFamily(self, address):
+        """
+        Returns the name of the family an address belongs to, or
+        None if it is not rate limited.
+        """
+        try:
+            return self.familyCache[address]
+        except KeyError:
+            family = None
+            for name in self.families.keys():
+                for prefix in self.families[name][0]:
+                    if address.startswith(prefix):
+                        family = name
+            self.familyCache[address] = family
+            return family
+
+    def setFamilyRate(self, family, rate, prefixes=None):
+        """
+        Limits the messages of an address family to be sent at most
+        rate times per second.  A rate of 0 removes the limit.  The
+        prefixes of a new family have to be given.
+        """
+        if prefixes == None:
+            prefixes = self.families[family][0]
+        interval = 0.0
+        if rate > 0:
+            interval = 1.0 / rate
+        self.families[family] = (tuple(prefixes), interval)
+        self.familyCache.clear()
+
+    def resetStats(self):
+        self.sentCount = 0
+        self.packetCount = 0
+        self.bundleCount = 0
+        self.coalescedCount = 0
+        self.droppedCount = 0
+
     def processIncomingUDP(self):
         """
         This is the function that deals with incoming UDP messages.
@@ -233,6 +391,30 @@ class OSCEndpoint:
         port = msg[3]
         log('reconfigure to send to ' + host + ':' + str(port))
         self.remoteAddr = (host, port)
+
+    def callbackSetRate(self, msg, source):
+        """
+        Sets the maximum rate of an address family.  The first
+        argument is the name of the family (meters, positions or
+        names), the second the number of updates per second.
+        """
+        family = msg[2]
+        if self.families.has_key(family):
+            self.setFamilyRate(family, msg[3])
+        else:
+            self.send('/remix/error', 'unknown address family ' + str(family))
+
+    def callbackStats(self, msg, source):
+        """
+        When we receive a '/remix/stats' OSC query we respond with
+        the statistics of the output queue: the number of messages
+        sent, packets sent, bundles sent, messages replaced by a
+        newer one, messages dropped and messages still queued.  The
+        statistics are reset if the optional argument is 1.
+        """
+        self.send('/remix/stats', (self.sentCount, self.packetCount, self.bundleCount, self.coalescedCount, self.droppedCount, len(self.queueOrder)))
+        if len(msg) > 2 and msg[2] == 1:
+            self.resetStats()
   
     def callbackEcho(self, msg, source):
         """
@@ -1,6 +1,7 @@
 #Embedded file name: C:\ProgramData\Ableton\Live 8\Resources\MIDI Remote Scripts\Maschine_Mk1\MIDI_Map.py
 from PadScale import PadScale
 USE_DISPLAY = False
+MIDI_MESSAGES_PER_TICK = 150
 PM_OFF = 0
 PM_ON = 1
 SCENE_MODE = 1
@@ -1,7 +1,6 @@
 #Embedded file name: C:\ProgramData\Ableton\Live 8\Resources\MIDI Remote Scripts\Maschine_Mk1\MaschineControlSurface.py
 import Live
 import MidiRemoteScript
-import time
 from VarButtonElement import VarButtonElement
 from VarButtonElement import TwinButton
 from MaschineSessionComponent import MaschineSessionComponent
@@ -11,6 +10,7 @@ from SceneMatrix import SceneMatrix
 from MainKnobControl import MainKnobControl
 from MIDI_Map import *
 from _Framework.ControlSurface import ControlSurface
+from _Framework.MidiQueue import PacedMidiQueue
 from _Framework.InputControlElement import *
 from _Framework.SliderElement import SliderElement
 from _Framework.ButtonElement import ButtonElement
@@ -26,6 +26,8 @@ class MaschineControlSurface(ControlSurface):
 
     def __init__(self, c_instance):
         ControlSurface.__init__(self, c_instance)
+        self._midi_queue = PacedMidiQueue(send_midi=c_instance.send_midi, messages_per_tick=MIDI_MESSAGES_PER_TICK)
+        self._task_group.add(self._midi_queue.make_drain_task())
         self.set_suppress_rebuild_requests(True)
         self._active = True
         self.value_encoder_tempo = None
@@ -421,7 +423,6 @@ class MaschineControlSurface(ControlSurface):
             for column in range(4):
                 button = self._matrix[row][column]
                 button.send_value(0)
-                time.sleep(0.001)
                 button.set_to_notemode(True)
                 fwkey = [MIDI_NOTE_ON_STATUS]
                 fwkey.append(button.get_identifier())
@@ -1285,12 +1286,16 @@ class MaschineControlSurface(ControlSurface):
         msgsysex.append(247)
         self._send_midi(tuple(msgsysex))
 
+    def _do_send_midi(self, midi_event_bytes):
+        return self._midi_queue.send(midi_event_bytes)
+
     def disconnect(self):
         self._active = False
         self.send_to_display('', 0)
         self.send_to_display('', 1)
         self.send_to_display('', 2)
         self.send_to_display('', 3)
+        self._midi_queue.flush()
         self.set_suppress_rebuild_requests(True)
         self._scenematrix.disconnect()
         self._master_knob.disconnect()
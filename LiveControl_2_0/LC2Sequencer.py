@@ -3,6 +3,7 @@ from _Framework.ControlSurfaceComponent import ControlSurfaceComponent
 from LC2Sysex import LC2Sysex, LC2SysexParser
 import random
 import math
+NOTE_TIME_EPSILON = 1e-05
 
 class LC2Sequencer(ControlSurfaceComponent):
 
@@ -55,6 +56,7 @@ class LC2Sequencer(ControlSurfaceComponent):
         self._fold_notes = 0
         self._save_note = 0
         self._ltime = ''
+        self._sent_blocks = {}
         self._chord_intervals = [[0, 4, 7],
          [0, 3, 7],
          [0, 4, 8],
@@ -114,6 +116,7 @@ class LC2Sequencer(ControlSurfaceComponent):
 
         self._clip = clip
         self._slot = slot
+        self.reset_sent_blocks()
         if clip is not None:
             self._clip.add_playing_position_listener(self._on_playing_position_changed)
             self._clip.add_notes_listener(self._on_notes_changed)
@@ -561,9 +564,7 @@ class LC2Sequencer(ControlSurfaceComponent):
                 note[4] = bool(state)
 
         if found:
-            self._clip.select_all_notes()
-            self._clip.replace_selected_notes(tuple(self._note_cache))
-            self._clip.deselect_all_notes()
+            self._replace_notes([ note for note in self._note_cache if note[0] == pitch ])
 
     def _note_press(self, sysex):
         x, y = sysex.parse('bb')
@@ -601,7 +602,11 @@ class LC2Sequencer(ControlSurfaceComponent):
         self._clip = None
 
     def on_enabled_changed(self):
-        pass
+        self.reset_sent_blocks()
+
+    def reset_sent_blocks(self):
+        """ Forgets which blocks the app got, so that the next update sends all of them """
+        self._sent_blocks = {}
 
     def _on_notes_changed(self):
         self._refresh = 5
@@ -665,15 +670,23 @@ class LC2Sequencer(ControlSurfaceComponent):
     def rem_note(self, pos, pos2, pitch):
         if self._clip is not None:
             new_notes = []
+            removed = []
             for nt in self._note_cache:
-                self._last_details = nt[0] == pitch and nt[1] >= pos and nt[1] < pos2 and nt
-                continue
+                if nt[0] == pitch and nt[1] >= pos and nt[1] < pos2:
+                    self._last_details = nt
+                    removed.append(nt)
+                    continue
                 new_notes.append(nt)
 
-            self._clip.select_all_notes()
-            self._clip.replace_selected_notes(tuple(new_notes))
-            self._clip.deselect_all_notes()
             self._note_cache = new_notes
+            if LC2Sysex.l9():
+                for nt in removed:
+                    self._clip.remove_notes(nt[1], nt[0], NOTE_TIME_EPSILON, 1)
+
+            else:
+                self._clip.select_all_notes()
+                self._clip.replace_selected_notes(tuple(new_notes))
+                self._clip.deselect_all_notes()
             if len(self._note_keys()) == 0:
                 self._fold_notes = 0
             self.update()
@@ -694,16 +707,17 @@ class LC2Sequencer(ControlSurfaceComponent):
         for b in array:
             sysex.int2(b)
 
-        sysex.send()
+        self._send_block(sysex)
         sysex = LC2Sysex('STEPS2')
         for b in array_l:
             sysex.int2(b)
 
-        sysex.send()
+        self._send_block(sysex)
         sysex = LC2Sysex('SEQ_FADERS')
         states = 0
+        faders = self._get_faders()
         for i in range(16):
-            fad = self._get_fader(i)[0]
+            fad = faders[i][0]
             if fad == -1:
                 sysex.byte(0)
             else:
@@ -711,7 +725,7 @@ class LC2Sequencer(ControlSurfaceComponent):
                 sysex.byte(fad)
 
         sysex.int2(states)
-        sysex.send()
+        self._send_block(sysex)
         self._get_timeline()
         self._get_note_line()
         sysex = LC2Sysex('SEQ_MUTES')
@@ -720,17 +734,24 @@ class LC2Sequencer(ControlSurfaceComponent):
             mutes |= self._mutes[self._note(i)] << self._height - 1 - i
 
         sysex.int2(mutes)
-        sysex.send()
+        self._send_block(sysex)
         sysex = LC2Sysex('SEQ_FOLD')
         sysex.byte(self._fold_notes)
-        sysex.send()
+        self._send_block(sysex)
         sysex = LC2Sysex('SEQ_QUANT')
         sysex.int(int(self._quantisation * 1000))
-        LC2Sysex.log_message(str(int(self._quantisation * 1000)))
-        sysex.send()
+        self._send_block(sysex)
         sysex = LC2Sysex('SEQ_SAVE_NOTE')
         sysex.byte(self._save_note)
-        sysex.send()
+        self._send_block(sysex)
+
+    def _send_block(self, sysex):
+        """ Sends one of the sequencer state blocks, unless the app already got
+        exactly the same block """
+        msg = sysex.msg()
+        if self._sent_blocks.get(msg[1:3]) != msg:
+            self._sent_blocks[msg[1:3]] = msg
+            sysex.send()
 
     def _send_offsets(self):
         sysex = LC2Sysex('SEQ_OFFSETS')
@@ -756,15 +777,28 @@ class LC2Sequencer(ControlSurfaceComponent):
             if note[0] == self._last_note:
                 if self._step(note[1]) == step:
                     pos = note[1]
-                    if self._fader_type == 0:
-                        val = note[3]
-                    elif self._fader_type == 1:
-                        val = int(round(self._nearest(self._durations, note[2]) * 15.875, 0))
-                    else:
-                        val = int(note[1] % self._quantisation / self._quantisation * 127)
+                    val = self._fader_value(note)
 
         return [val, pos]
 
+    def _get_faders(self):
+        faders = [ [-1, -1] for i in range(16) ]
+        for note in self._note_cache:
+            if note[0] == self._last_note:
+                step = self._step(note[1])
+                if step in range(16):
+                    faders[step] = [self._fader_value(note), note[1]]
+
+        return faders
+
+    def _fader_value(self, note):
+        if self._fader_type == 0:
+            return note[3]
+        elif self._fader_type == 1:
+            return int(round(self._nearest(self._durations, note[2]) * 15.875, 0))
+        else:
+            return int(note[1] % self._quantisation / self._quantisation * 127)
+
     def _nearest(self, list, val):
         for i, v in enumerate(list):
             if val <= v:
@@ -828,19 +862,34 @@ class LC2Sequencer(ControlSurfaceComponent):
                 self._last_pos = step
 
     def _set_note_param(self, pitch, start, param, val):
-        found = 0
-        for note in self._note_cache:
-            if note[0] == pitch and note[1] == start:
+        notes = [ note for note in self._note_cache if note[0] == pitch and note[1] == start ]
+        if notes:
+            for note in notes:
                 note[param] = val
-                self._clip.select_all_notes()
-                self._clip.replace_selected_notes(tuple(self._note_cache))
-                self._clip.deselect_all_notes()
-                found = 1
 
-        return found
+            self._replace_notes(notes, [(pitch, start)])
+        return len(notes) > 0
+
+    def _replace_notes(self, notes, old_keys = None):
+        """ Writes the given changed notes of the note cache to the clip. Live 9
+        allows to only remove and set those notes, older versions need all notes
+        of the clip to be replaced. old_keys are the (pitch, start) pairs the
+        notes had in the clip, if they differ from the current ones """
+        if LC2Sysex.l9():
+            if old_keys is None:
+                old_keys = set([ (note[0], note[1]) for note in notes ])
+            for pitch, start in old_keys:
+                self._clip.remove_notes(start, pitch, NOTE_TIME_EPSILON, 1)
+
+            self._clip.set_notes(tuple([ (note[0], note[1], note[2], note[3], bool(note[4])) for note in notes ]))
+        else:
+            self._clip.select_all_notes()
+            self._clip.replace_selected_notes(tuple(self._note_cache))
+            self._clip.deselect_all_notes()
 
     def _get_timeline(self):
         sysex = LC2Sysex('SEQ_TIMELINE')
+        self._ltime = ''
         for i in range(8):
             if self._clip != None:
                 if self._pos(i * 2) < self._clip.length:
@@ -855,7 +904,7 @@ class LC2Sequencer(ControlSurfaceComponent):
             else:
                 sysex.ascii('')
 
-        sysex.send()
+        self._send_block(sysex)
 
     def _get_note_line(self):
         if self._fold_notes == 1:
@@ -870,7 +919,7 @@ class LC2Sequencer(ControlSurfaceComponent):
             else:
                 sysex.ascii(self._to_note(self._note(i)))
 
-        sysex.send()
+        self._send_block(sysex)
 
     def _beat_time(self, time):
         beats = int(time % 4)
@@ -202,6 +202,8 @@ class LiveControl2(ControlSurface):
         self._modulator.send_params()
         sysex = LC2Sysex('RESET')
         sysex.send()
+        self._sequencer.reset_sent_blocks()
+        self._sequencer.update()
 
     def suggest_input_port(self):
         return 'Daemon Input '
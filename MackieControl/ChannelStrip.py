@@ -18,7 +18,6 @@ class ChannelStrip(MackieControlComponent):
         self.__fader_parameter = None
         self.__signal_led_enabled = True
         self.__meters_enabled = False
-        self.__last_meter_value = -1
         self.__send_meter_mode()
         self.__within_track_added_or_deleted = False
         self.__within_destroy = False
@@ -169,7 +168,7 @@ class ChannelStrip(MackieControlComponent):
         self.__update_arm_led()
         if not self.__within_destroy and self.__assigned_track != None:
             self.__send_meter_mode()
-            self.__last_meter_value = -1
+            self.main_script().meter_stream().forget_level(self.__strip_index)
         if not self.__assigned_track:
             self.reset_fader()
             self.unlight_vpot_leds()
@@ -184,10 +183,7 @@ class ChannelStrip(MackieControlComponent):
                     meter_value = self.__assigned_track.output_meter_level
             else:
                 meter_value = 0.0
-            meter_byte = int(meter_value * 12.0) + (self.__strip_index << 4)
-            if self.__last_meter_value != meter_value or meter_value != 0.0:
-                self.__last_meter_value = meter_value
-                self.send_midi((208, meter_byte))
+            self.main_script().meter_stream().set_level(self.__strip_index, int(meter_value * METER_NUM_SEGMENTS))
 
     def build_midi_map(self, midi_map_handle):
         needs_takeover = False
@@ -7,6 +7,7 @@ from ChannelStrip import ChannelStrip, MasterChannelStrip
 from ChannelStripController import ChannelStripController
 from SoftwareController import SoftwareController
 from Transport import Transport
+from MeterStream import MeterStream
 import Live
 import MidiRemoteScript
 
@@ -32,6 +33,7 @@ class MackieControl:
         self.__components.append(self.__software_controller)
         self.__transport = Transport(self)
         self.__components.append(self.__transport)
+        self.__meter_stream = MeterStream(self)
         self.__channel_strips = [ ChannelStrip(self, i) for i in range(NUM_CHANNEL_STRIPS) ]
         for s in self.__channel_strips:
             self.__components.append(s)
@@ -40,6 +42,7 @@ class MackieControl:
         self.__components.append(self.__master_strip)
         self.__channel_strip_controller = ChannelStripController(self, self.__channel_strips, self.__master_strip, self.__main_display_controller)
         self.__components.append(self.__channel_strip_controller)
+        self.__components.append(self.__meter_stream)
         self.__shift_is_pressed = False
         self.__option_is_pressed = False
         self.__ctrl_is_pressed = False
@@ -97,6 +100,9 @@ class MackieControl:
     def is_extension(self):
         return False
 
+    def meter_stream(self):
+        return self.__meter_stream
+
     def request_rebuild_midi_map(self):
         """ To be called from any components, as soon as their internal state changed in a
         way, that we do need to remap the mappings that are processed directly by the
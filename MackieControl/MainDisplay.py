@@ -1,14 +1,43 @@
 # Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/MackieControl/MainDisplay.py
 from MackieControlComponent import *
 
+class DisplayByteBudget:
+    """ The number of display sysex bytes that may still be sent in the current
+        display timer tick, shared by the main display and all extension displays
+    """
+
+    def __init__(self, bytes_per_tick = DISPLAY_BYTES_PER_TICK):
+        self.__bytes_per_tick = bytes_per_tick
+        self.__bytes_left = bytes_per_tick
+
+    def reset(self):
+        self.__bytes_left = self.__bytes_per_tick
+
+    def bytes_left(self):
+        return self.__bytes_left
+
+    def spend(self, num_bytes):
+        """ Returns True and books the bytes if they still fit into this tick
+        """
+        if num_bytes > self.__bytes_left:
+            return False
+        self.__bytes_left -= num_bytes
+        return True
+
+
 class MainDisplay(MackieControlComponent):
     """ Representing one main 2 row display of a Mackie Control or Extension
+
+        A shadow of what the display currently shows is kept, so that only the
+        changed spans of a row are sent, using the offset field of the display
+        sysex. Spans that are closer together than the cost of an additional
+        sysex header get merged into one message.
     """
 
     def __init__(self, main_script):
         MackieControlComponent.__init__(self, main_script)
         self.__stack_offset = 0
-        self.__last_send_messages = [[], []]
+        self.__shadow = []
 
     def destroy(self):
         NUM_CHARS_PER_DISPLAY_LINE = 54
@@ -27,35 +56,58 @@ class MainDisplay(MackieControlComponent):
         """
         self.__stack_offset = offset
 
-    def send_display_string(self, display_string, display_row, cursor_offset):
+    def send_display_string(self, display_string, display_row, cursor_offset, budget = None):
+        """ Sends the parts of the string that differ from what the display shows.
+            When a budget is given, spans that do not fit into it are left out and
+            will be sent by one of the next calls, as the shadow stays unchanged.
+        """
         if display_row == 0:
             offset = cursor_offset
         elif display_row == 1:
             offset = NUM_CHARS_PER_DISPLAY_LINE + 2 + cursor_offset
         else:
-            raise 0 or AssertionError
+            assert False
         message_string = [ ord(c) for c in display_string ]
         for i in range(len(message_string)):
             if message_string[i] >= 128:
                 message_string[i] = 0
 
-        if self.__last_send_messages[display_row] != message_string:
-            self.__last_send_messages[display_row] = message_string
-            if self.main_script().is_extension():
-                device_type = SYSEX_DEVICE_TYPE_XT
-            else:
-                device_type = SYSEX_DEVICE_TYPE
+        if len(self.__shadow) < offset + len(message_string):
+            self.__shadow.extend([None] * (offset + len(message_string) - len(self.__shadow)))
+        if self.main_script().is_extension():
+            device_type = SYSEX_DEVICE_TYPE_XT
+        else:
+            device_type = SYSEX_DEVICE_TYPE
+        for start, end in self.__changed_spans(message_string, offset):
+            if budget != None and not budget.spend(end - start + DISPLAY_SYSEX_OVERHEAD):
+                break
+            self.__shadow[offset + start:offset + end] = message_string[start:end]
             display_sysex = (240,
              0,
              0,
              102,
              device_type,
              18,
-             offset) + tuple(message_string) + (247,)
+             offset + start) + tuple(message_string[start:end]) + (247,)
             self.send_midi(display_sysex)
 
+    def __changed_spans(self, message_string, offset):
+        """ Returns the (start, end) ranges of the message that differ from the
+            shadow. Unchanged gaps that are cheaper to resend than to start a new
+            sysex for are merged into the surrounding spans.
+        """
+        spans = []
+        for index, char in enumerate(message_string):
+            if self.__shadow[offset + index] != char:
+                if spans and index - spans[-1][1] <= DISPLAY_SYSEX_OVERHEAD:
+                    spans[-1][1] = index + 1
+                else:
+                    spans.append([index, index + 1])
+
+        return spans
+
     def refresh_state(self):
-        self.__last_send_messages = [[], []]
+        self.__shadow = []
 
     def on_update_display_timer(self):
         pass
\ No newline at end of file
@@ -1,5 +1,7 @@
 # Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/MackieControl/MainDisplayController.py
 from MackieControlComponent import *
+from MainDisplay import DisplayByteBudget
+from _Framework.DisplayDataSource import abbreviate_string, STRIP_STRING_REMOVALS
 
 class MainDisplayController(MackieControlComponent):
     """ Controlling all available main displays (the display above the channel strips),
@@ -27,6 +29,7 @@ class MainDisplayController(MackieControlComponent):
         self.__bank_channel_offset = 0
         self.__meters_enabled = False
         self.__show_return_tracks = False
+        self.__byte_budget = DisplayByteBudget()
 
     def destroy(self):
         self.enable_meters(False)
@@ -97,6 +100,7 @@ class MainDisplayController(MackieControlComponent):
 
     def on_update_display_timer(self):
         strip_index = 0
+        self.__byte_budget.reset()
         for display in self.__displays:
             if self.__channel_strip_mode:
                 upper_string = u''
@@ -129,9 +133,9 @@ class MainDisplayController(MackieControlComponent):
                     lower_string += ' '
                     strip_index += 1
 
-                display.send_display_string(upper_string, 0, 0)
+                display.send_display_string(upper_string, 0, 0, self.__byte_budget)
                 if not self.__meters_enabled:
-                    display.send_display_string(lower_string, 1, 0)
+                    display.send_display_string(lower_string, 1, 0, self.__byte_budget)
             else:
                 ascii_message = '< _1234 guck ma #!?:;_ >'
                 if not self.__test:
@@ -144,24 +148,4 @@ class MainDisplayController(MackieControlComponent):
     def __generate_6_char_string(self, display_string):
         if not display_string:
             return '      '
-        if len(display_string.strip()) > 6 and display_string.endswith('dB') and display_string.find('.') != -1:
-            display_string = display_string[:-2]
-        if len(display_string) > 6:
-            for um in [' ',
-             'i',
-             'o',
-             'u',
-             'e',
-             'a']:
-                while len(display_string) > 6 and display_string.rfind(um, 1) != -1:
-                    um_pos = display_string.rfind(um, 1)
-                    display_string = display_string[:um_pos] + display_string[um_pos + 1:]
-
-        else:
-            display_string = display_string.center(6)
-        ret = u''
-        for i in range(6):
-            ret += display_string[i]
-
-        raise len(ret) == 6 or AssertionError
-        return ret
\ No newline at end of file
+        return abbreviate_string(display_string, 6, STRIP_STRING_REMOVALS, centered=True)
\ No newline at end of file
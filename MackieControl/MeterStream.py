@@ -0,0 +1,67 @@
+# Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/MackieControl/MeterStream.py
+from MackieControlComponent import *
+
+class MeterStream(MackieControlComponent):
+    """Sends the meter levels of all channel strips of one unit together, once per
+       display timer tick after the strips did set them.
+       As the unit lets its meters decay on its own, a level is only sent when the
+       meter would otherwise show less than it. At most 'max_messages_per_tick' meter
+       messages are sent per tick, the ones of the strips that lag the most first.
+    """
+
+    def __init__(self, main_script, max_messages_per_tick = METER_MESSAGES_PER_TICK):
+        MackieControlComponent.__init__(self, main_script)
+        self.__max_messages_per_tick = max_messages_per_tick
+        self.__levels = {}
+        self.__sent_levels = {}
+        self.__tick = 0
+
+    def destroy(self):
+        self.__levels = {}
+        self.__sent_levels = {}
+        MackieControlComponent.destroy(self)
+
+    def max_messages_per_tick(self):
+        return self.__max_messages_per_tick
+
+    def set_max_messages_per_tick(self, max_messages_per_tick):
+        assert max_messages_per_tick >= 1
+        self.__max_messages_per_tick = max_messages_per_tick
+
+    def set_level(self, strip_index, level):
+        """Sets the meter level in segments (0 to METER_NUM_SEGMENTS) that should be
+           shown for the given strip on this tick
+        """
+        assert 0 <= level <= METER_NUM_SEGMENTS
+        self.__levels[strip_index] = level
+
+    def forget_level(self, strip_index):
+        """Makes the next level of the given strip to be sent, no matter what its
+           meter shows
+        """
+        if strip_index in self.__sent_levels:
+            del self.__sent_levels[strip_index]
+
+    def refresh_state(self):
+        self.__sent_levels = {}
+
+    def on_update_display_timer(self):
+        self.__tick += 1
+        lagging_strips = []
+        for strip_index, level in self.__levels.iteritems():
+            if strip_index in self.__sent_levels:
+                sent_level, sent_tick = self.__sent_levels[strip_index]
+                ticks_since_sent = self.__tick - sent_tick
+                shown_level = max(0, sent_level - ticks_since_sent / METER_DECAY_TICKS)
+                if level > shown_level:
+                    lagging_strips.append((level - shown_level, ticks_since_sent, strip_index))
+            else:
+                lagging_strips.append((METER_NUM_SEGMENTS + 1, 0, strip_index))
+
+        lagging_strips.sort(reverse=True)
+        for _, _, strip_index in lagging_strips[:self.__max_messages_per_tick]:
+            level = self.__levels[strip_index]
+            self.send_midi((208, level + (strip_index << 4)))
+            self.__sent_levels[strip_index] = (level, self.__tick)
+
+        self.__levels.clear()
@@ -9,23 +9,35 @@ class TimeDisplay(MackieControlComponent):
         self.__main_script = main_script
         self.__show_beat_time = False
         self.__smpt_format = Live.Song.TimeFormat.smpte_25
-        self.__last_send_time = []
+        self.__last_send_digits = [ None for i in range(NUM_TIME_DISPLAY_DIGITS) ]
+        self.__last_send_mode_leds = None
+        self.__update_interval = TIME_DISPLAY_UPDATE_INTERVAL
+        self.__ticks_until_update = 0
         self.show_beats()
 
     def destroy(self):
         self.clear_display()
         MackieControlComponent.destroy(self)
 
+    def update_interval(self):
+        return self.__update_interval
+
+    def set_update_interval(self, interval):
+        """ Limits the refresh rate of the clock: it will only be updated on every
+            'interval'th display timer tick
+        """
+        assert interval >= 1
+        self.__update_interval = interval
+        self.__ticks_until_update = 0
+
     def show_beats(self):
         self.__show_beat_time = True
-        self.send_midi((NOTE_ON_STATUS, SELECT_BEATS_NOTE, BUTTON_STATE_ON))
-        self.send_midi((NOTE_ON_STATUS, SELECT_SMPTE_NOTE, BUTTON_STATE_OFF))
+        self.__send_mode_leds(BUTTON_STATE_ON, BUTTON_STATE_OFF)
 
     def show_smpte(self, smpte_mode):
         self.__show_beat_time = False
         self.__smpt_format = smpte_mode
-        self.send_midi((NOTE_ON_STATUS, SELECT_BEATS_NOTE, BUTTON_STATE_OFF))
-        self.send_midi((NOTE_ON_STATUS, SELECT_SMPTE_NOTE, BUTTON_STATE_ON))
+        self.__send_mode_leds(BUTTON_STATE_OFF, BUTTON_STATE_ON)
 
     def toggle_mode(self):
         if self.__show_beat_time:
@@ -34,31 +46,48 @@ class TimeDisplay(MackieControlComponent):
             self.show_beats()
 
     def clear_display(self):
-        time_string = [ ' ' for i in range(10) ]
+        time_string = [ ' ' for i in range(NUM_TIME_DISPLAY_DIGITS) ]
         self.__send_time_string(time_string, show_points=False)
-        self.send_midi((NOTE_ON_STATUS, SELECT_BEATS_NOTE, BUTTON_STATE_OFF))
-        self.send_midi((NOTE_ON_STATUS, SELECT_SMPTE_NOTE, BUTTON_STATE_OFF))
+        self.__send_mode_leds(BUTTON_STATE_OFF, BUTTON_STATE_OFF)
 
     def refresh_state(self):
+        self.__last_send_digits = [ None for i in range(NUM_TIME_DISPLAY_DIGITS) ]
+        self.__last_send_mode_leds = None
         self.show_beats()
-        self.__last_send_time = []
 
     def on_update_display_timer(self):
-        """Called by a timer which gets called every 100 ms. We will simply check if the"""
+        """Called by a timer which gets called every 100 ms. We will simply check if the
+           time changed, and only send the digits that differ from the ones on the display
+        """
+        if self.__ticks_until_update > 0:
+            self.__ticks_until_update -= 1
+            return
+        self.__ticks_until_update = self.__update_interval - 1
         if self.__show_beat_time:
             time_string = str(self.song().get_current_beats_song_time())
         else:
             time_string = str(self.song().get_current_smpte_song_time(self.__smpt_format))
         time_string = [ c for c in time_string if c not in ('.', ':') ]
-        if self.__last_send_time != time_string:
-            self.__last_send_time = time_string
-            self.__send_time_string(time_string, show_points=True)
+        self.__send_time_string(time_string, show_points=True)
+
+    def __send_mode_leds(self, beats_state, smpte_state):
+        """ Sends the state of the two mode LEDs, but only when it changed. A mode
+            switch will also update the clock on the next timer tick, no matter
+            what the update interval is
+        """
+        if self.__last_send_mode_leds != (beats_state, smpte_state):
+            self.__last_send_mode_leds = (beats_state, smpte_state)
+            self.__ticks_until_update = 0
+            self.send_midi((NOTE_ON_STATUS, SELECT_BEATS_NOTE, beats_state))
+            self.send_midi((NOTE_ON_STATUS, SELECT_SMPTE_NOTE, smpte_state))
 
     def __send_time_string(self, time_string, show_points):
-        raise len(time_string) >= 10 or AssertionError
-        for c in range(0, 10):
-            char = time_string[9 - c].upper()
+        assert len(time_string) >= NUM_TIME_DISPLAY_DIGITS
+        for c in range(0, NUM_TIME_DISPLAY_DIGITS):
+            char = time_string[NUM_TIME_DISPLAY_DIGITS - 1 - c].upper()
             char_code = g7_seg_led_conv_table[char]
             if show_points and c in (3, 5, 7):
                 char_code += 64
-            self.send_midi((176, 64 + c, char_code))
\ No newline at end of file
+            if self.__last_send_digits[c] != char_code:
+                self.__last_send_digits[c] = char_code
+                self.send_midi((176, 64 + c, char_code))
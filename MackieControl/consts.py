@@ -13,9 +13,16 @@ BUTTON_STATE_BLINKING = 1
 BUTTON_PRESSED = 1
 BUTTON_RELEASED = 0
 NUM_CHARS_PER_DISPLAY_LINE = 54
+DISPLAY_SYSEX_OVERHEAD = 8
+DISPLAY_BYTES_PER_TICK = 512
 SELECT_SMPTE_NOTE = 113
 SELECT_BEATS_NOTE = 114
 SELECT_RUDE_SOLO = 115
+NUM_TIME_DISPLAY_DIGITS = 10
+TIME_DISPLAY_UPDATE_INTERVAL = 1
+METER_NUM_SEGMENTS = 12
+METER_DECAY_TICKS = 3
+METER_MESSAGES_PER_TICK = 4
 FID_PANNING_BASE = 16
 JOG_WHEEL_CC_NO = 60
 VPOT_DISPLAY_SINGLE_DOT = 0
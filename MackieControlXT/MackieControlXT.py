@@ -2,6 +2,7 @@
 from MackieControl.consts import *
 from MackieControl.MainDisplay import MainDisplay
 from MackieControl.ChannelStrip import ChannelStrip
+from MackieControl.MeterStream import MeterStream
 import Live
 
 class MackieControlXT:
@@ -14,10 +15,13 @@ class MackieControlXT:
         self.__components = []
         self.__main_display = MainDisplay(self)
         self.__components.append(self.__main_display)
+        self.__meter_stream = MeterStream(self)
         self.__channel_strips = [ ChannelStrip(self, i) for i in range(NUM_CHANNEL_STRIPS) ]
         for s in self.__channel_strips:
             self.__components.append(s)
 
+        self.__components.append(self.__meter_stream)
+
         self.__mackie_control_main = None
         return
 
@@ -31,6 +35,9 @@ class MackieControlXT:
     def is_extension(self):
         return True
 
+    def meter_stream(self):
+        return self.__meter_stream
+
     def mackie_control_main(self, mackie_control_main):
         return self.__mackie_control_main
 
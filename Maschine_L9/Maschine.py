@@ -2,7 +2,6 @@
 from __future__ import with_statement
 import Live
 import MidiRemoteScript
-import time
 from VarButtonElement import VarButtonElement, TwinButton
 from StateButton import StateButton, ToggleButton
 from MaschineSessionComponent import MaschineSessionComponent
@@ -12,6 +11,7 @@ from SceneMatrix import SceneMatrix
 from MainKnobControl import MainKnobControl
 from MIDI_Map import *
 from _Framework.ControlSurface import ControlSurface, _scheduled_method
+from _Framework.MidiQueue import PacedMidiQueue
 from _Framework.InputControlElement import *
 from _Framework.SliderElement import SliderElement
 from _Framework.ButtonElement import ButtonElement
@@ -27,12 +27,13 @@ class Maschine(ControlSurface):
 
     def __init__(self, c_instance):
         ControlSurface.__init__(self, c_instance, False)
+        self._midi_queue = PacedMidiQueue(send_midi=c_instance.send_midi, messages_per_tick=MIDI_MESSAGES_PER_TICK)
+        self._task_group.add(self._midi_queue.make_drain_task())
         with self.component_guard():
             self._c_ref = c_instance
             register_sender(self)
             self._set_suppress_rebuild_requests(True)
             self._active = True
-            self._midi_pause_count = 0
             self._suggested_input_port = str('Maschine Controller In')
             self._suggested_output_port = str('Maschine Controller Out')
             self.value_encoder_tempo = None
@@ -891,13 +892,7 @@ class Maschine(ControlSurface):
                 self._scenematrix.set_mode(SCENE_MODE_STOP)
 
     def _send_midi(self, midi_bytes, **keys):
-        self._c_ref.send_midi(midi_bytes)
-        if self._midi_pause_count == 2:
-            time.sleep(0.002)
-            self._midi_pause_count = 0
-        else:
-            self._midi_pause_count = self._midi_pause_count + 1
-        return True
+        return self._midi_queue.send(midi_bytes)
 
     def do_test(self, value):
         if value == 0:
@@ -1326,6 +1321,7 @@ class Maschine(ControlSurface):
         self.send_to_display('', 1)
         self.send_to_display('', 2)
         self.send_to_display('', 3)
+        self._midi_queue.flush()
         self._set_suppress_rebuild_requests(True)
         self._master_knob.disconnect()
         self.xfadeKnob.disconnect()
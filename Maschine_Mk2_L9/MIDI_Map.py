@@ -12,6 +12,7 @@ def debug_out(message):
 
 
 USE_DISPLAY = False
+MIDI_MESSAGES_PER_TICK = 150
 PM_OFF = 0
 PM_ON = 1
 SCENE_MODE = 1
@@ -2,9 +2,9 @@
 from __future__ import with_statement
 import Live
 import MidiRemoteScript
-import time
 from functools import partial
 from _Framework.Task import Task
+from _Framework.MidiQueue import PacedMidiQueue
 from _Framework.SubjectSlot import subject_slot
 from PadScale import *
 from MIDI_Map import *
@@ -34,6 +34,8 @@ class MaschineMk2(ControlSurface):
 
     def __init__(self, c_instance):
         ControlSurface.__init__(self, c_instance, False)
+        self._midi_queue = PacedMidiQueue(send_midi=c_instance.send_midi, messages_per_tick=MIDI_MESSAGES_PER_TICK)
+        self._task_group.add(self._midi_queue.make_drain_task())
         with self.component_guard():
             self._suppress_send_midi = True
             self.togglecolor = (10, 30, 50, 70, 90)
@@ -49,7 +51,6 @@ class MaschineMk2(ControlSurface):
             self._mode = CLIP_MODE
             self.init_slot = 0
             self.init_done = False
-            self._midi_pause_count = 0
             self.nav_index = 0
             self._base_note = 0
             self._octave = 0.55
@@ -362,13 +363,7 @@ class MaschineMk2(ControlSurface):
             return KEY_COLOR_MAP[midi_note % 12][1]
 
     def _send_midi(self, midi_bytes, **keys):
-        self._c_ref.send_midi(midi_bytes)
-        if self._midi_pause_count == 2:
-            time.sleep(0.002)
-            self._midi_pause_count = 0
-        else:
-            self._midi_pause_count = self._midi_pause_count + 1
-        return True
+        return self._midi_queue.send(midi_bytes)
 
     def clip_handle(self):
         if self._mode == SCENE_MODE or self._mode == CONTROL_MODE or self._modifier_down:
@@ -1097,7 +1092,7 @@ class MaschineMk2(ControlSurface):
         self.clip_mode_button.send_value(0, True)
         self.pad_mode_button.send_value(0, True)
         self.control_mode_button.send_value(0, True)
-        time.sleep(0.2)
+        self._midi_queue.flush()
         self._active = False
         self._suppress_send_midi = True
         self.remove_listener(self.scene_mode_button, self._a_mode_scene)
@@ -74,15 +74,23 @@ class AutoArmComponent(CompoundComponent):
     """
     Component that implictly arms tracks to keep the selected track
     always armed while there is no compatible red-armed track.
+    
+    Only the previously and newly implicitly armed tracks are touched
+    on updates, all tracks are only reconciled when the track list
+    changes.  The red-armed tracks are kept track of, so that checking
+    whether auto-arm needs to be restored does not scan all tracks.
     """
 
     def __init__(self, *a, **k):
         super(AutoArmComponent, self).__init__(*a, **k)
         self._auto_arm_restore_behaviour = None
+        self._implicitly_armed_track = None
+        self._armed_tracks = set()
+        self._needs_reconcile = True
         self._notification = self.register_component(NotificationComponent(notification_time=10.0))
         self._on_tracks_changed.subject = self.song()
         self._on_exclusive_arm_changed.subject = self.song()
-        self._on_tracks_changed()
+        self._update_track_subjects()
         return
 
     notification_layer = forward_property('_notification')('message_box_layer')
@@ -111,44 +119,76 @@ class AutoArmComponent(CompoundComponent):
 
     def update(self):
         super(AutoArmComponent, self).update()
-        song = self.song()
         if self.is_enabled():
-            enabled = not self.needs_restore_auto_arm
-            selected_track = song.view.selected_track
-            for track in song.tracks:
-                if self.track_can_be_armed(track):
-                    track.implicit_arm = enabled and selected_track == track and self.can_auto_arm_track(track)
-
+            if self._needs_reconcile:
+                self._reconcile_implicit_arm()
+            else:
+                self._update_implicit_arm()
             self._auto_arm_restore_behaviour and self._auto_arm_restore_behaviour.update()
         self._update_notification()
 
+    def _auto_arm_target(self):
+        selected_track = self.song().view.selected_track
+        if not self.needs_restore_auto_arm and self.track_can_be_armed(selected_track) and self.can_auto_arm_track(selected_track):
+            return selected_track
+        return None
+
+    def _update_implicit_arm(self):
+        target = self._auto_arm_target()
+        old_target = self._implicitly_armed_track
+        if old_target != target and old_target != None and self.track_can_be_armed(old_target):
+            old_target.implicit_arm = False
+        if target != None and not target.implicit_arm:
+            target.implicit_arm = True
+        self._implicitly_armed_track = target
+
+    def _reconcile_implicit_arm(self):
+        target = self._auto_arm_target()
+        for track in self.song().tracks:
+            if self.track_can_be_armed(track):
+                track.implicit_arm = target == track
+
+        self._implicitly_armed_track = target
+        self._needs_reconcile = False
+
     def restore_auto_arm(self):
-        song = self.song()
-        exclusive_arm = song.exclusive_arm
-        for track in song.tracks:
+        exclusive_arm = self.song().exclusive_arm
+        for track in tuple(self._armed_tracks):
             if exclusive_arm or self.can_auto_arm_track(track):
-                if track.can_be_armed:
-                    track.arm = False
+                track.arm = False
 
     @property
     def needs_restore_auto_arm(self):
+        if not self._armed_tracks or not self.is_enabled():
+            return False
         song = self.song()
+        selected_track = song.view.selected_track
         exclusive_arm = song.exclusive_arm
-        return self.is_enabled() and self.can_auto_arm_track(song.view.selected_track) and not song.view.selected_track.arm and any(ifilter(lambda track: (exclusive_arm or self.can_auto_arm_track(track)) and track.can_be_armed and track.arm, song.tracks))
+        return self.can_auto_arm_track(selected_track) and not selected_track.arm and any(ifilter(lambda track: (exclusive_arm or self.can_auto_arm_track(track)) and track.can_be_armed and track.arm, self._armed_tracks))
 
-    @subject_slot('tracks')
-    def _on_tracks_changed(self):
+    def _update_track_subjects(self):
         tracks = filter(lambda t: t.can_be_armed, self.song().tracks)
+        self._armed_tracks = set(filter(lambda t: t.arm, tracks))
         self._on_arm_changed.replace_subjects(tracks)
         self._on_current_input_routing_changed.replace_subjects(tracks)
         self._on_frozen_state_changed.replace_subjects(tracks)
 
+    @subject_slot('tracks')
+    def _on_tracks_changed(self):
+        self._update_track_subjects()
+        self._needs_reconcile = True
+        self.update()
+
     @subject_slot('exclusive_arm')
     def _on_exclusive_arm_changed(self):
         self.update()
 
     @subject_slot_group('arm')
     def _on_arm_changed(self, track):
+        if track.arm:
+            self._armed_tracks.add(track)
+        else:
+            self._armed_tracks.discard(track)
         self.update()
 
     @subject_slot_group('current_input_routing')
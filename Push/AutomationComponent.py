@@ -1,27 +1,101 @@
 # Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/Push/AutomationComponent.py
+from itertools import izip
 import Live
 AutomationState = Live.DeviceParameter.AutomationState
 from _Framework import Task
 from _Framework.Control import EncoderControl, control_list
+from _Framework.SubjectSlot import subject_slot_group
 from _Framework.Util import clamp
 from DeviceParameterComponent import DeviceParameterComponent
 from Setting import EnumerableSetting
 
+class AutomationEditSession(object):
+    """
+    Samples the envelopes of the given parameters at the selected
+    steps once and accumulates the edits to them, which are written
+    to the envelopes in one batch per parameter on commit.
+    """
+
+    def __init__(self, clip = None, parameters = None, selected_time = None, value_at_time = None, *a, **k):
+        super(AutomationEditSession, self).__init__(*a, **k)
+        self._clip = clip
+        self._parameters = list(parameters)
+        self._selected_time = list(selected_time)
+        envelopes = [ (clip.automation_envelope(param) if param != None else None) for param in self._parameters ]
+        self._has_envelope = [ envelope != None for envelope in envelopes ]
+        self._values = [ [ (value_at_time(envelope, step) if envelope != None else 0.0) for step in self._selected_time ] for envelope in envelopes ]
+        self._pending_edits = set()
+
+    @property
+    def has_pending_edits(self):
+        return len(self._pending_edits) > 0
+
+    def value(self, parameter):
+        """
+        Returns the value of the parameter at the first selected step.
+        """
+        if parameter in self._parameters:
+            index = self._parameters.index(parameter)
+            if self._has_envelope[index] and self._selected_time:
+                return self._values[index][0]
+        return 0.0
+
+    def add_delta(self, index, delta):
+        """
+        Moves the values of the parameter at the given index at all
+        selected steps. Returns whether there is something to commit.
+        """
+        if not (0 <= index < len(self._parameters) and self._has_envelope[index]):
+            return False
+        param = self._parameters[index]
+        if param.is_quantized:
+            delta = delta / EnumerableSetting.STEP_SIZE
+        else:
+            delta = delta * (param.max - param.min)
+        values = self._values[index]
+        for step_index, value in enumerate(values):
+            values[step_index] = clamp(value + delta, param.min, param.max)
+
+        self._pending_edits.add(index)
+        return True
+
+    def commit(self):
+        pending_edits, self._pending_edits = self._pending_edits, set()
+        if self._clip == None:
+            return
+        for index in sorted(pending_edits):
+            param = self._parameters[index]
+            envelope = self._clip.automation_envelope(param)
+            if envelope != None:
+                if param.automation_state == AutomationState.overridden:
+                    param.re_enable_automation()
+                for time_range, value in izip(self._selected_time, self._values[index]):
+                    envelope.insert_step(time_range[0], time_range[1] - time_range[0], value)
+
+
 class AutomationComponent(DeviceParameterComponent):
+    """
+    Edits the automation of the parameters at the selected steps of
+    the clip. The envelopes are sampled once per selection, and the
+    encoder movements within a tick are written in one go.
+    """
     _clip = None
+    _edit_session = None
     encoders = control_list(EncoderControl)
 
     def __init__(self, *a, **k):
         super(AutomationComponent, self).__init__(*a, **k)
         self._selected_time = []
-        self._parameter_floats = []
         self._update_parameter_values_task = self._tasks.add(Task.run(self._update_parameter_values))
         self._update_parameter_values_task.kill()
+        self._commit_edits_task = self._tasks.add(Task.run(self._commit_edits))
+        self._commit_edits_task.kill()
 
     def _get_clip(self):
         return self._clip
 
     def _set_clip(self, value):
+        self._invalidate_edit_session()
         self._clip = value
         self._update_parameter_values_task.restart()
 
@@ -31,9 +105,9 @@ class AutomationComponent(DeviceParameterComponent):
         return self._selected_time
 
     def _set_selected_time(self, value):
+        self._invalidate_edit_session()
         self._selected_time = value or []
         self._update_parameter_values()
-        self._update_parameter_floats()
 
     selected_time = property(_get_selected_time, _set_selected_time)
 
@@ -45,8 +119,32 @@ class AutomationComponent(DeviceParameterComponent):
         self.encoders.set_control_element(encoders)
 
     def _update_parameters(self):
+        self._invalidate_edit_session()
         super(AutomationComponent, self)._update_parameters()
-        self._update_parameter_floats()
+        if self.is_enabled():
+            self._on_automation_state_changed.replace_subjects(self.parameters)
+
+    @subject_slot_group('automation_state')
+    def _on_automation_state_changed(self, parameter):
+        self._invalidate_edit_session()
+        self._update_parameter_values()
+
+    def _get_edit_session(self):
+        if self._edit_session == None and self._clip and len(self._selected_time) > 0:
+            self._edit_session = AutomationEditSession(clip=self._clip, parameters=self.parameters, selected_time=self._selected_time, value_at_time=self._value_at_time)
+        return self._edit_session
+
+    def _invalidate_edit_session(self):
+        if self._edit_session != None:
+            self._commit_edits()
+            self._edit_session = None
+        return
+
+    def _commit_edits(self):
+        self._commit_edits_task.kill()
+        session = self._edit_session
+        if session != None and session.has_pending_edits:
+            session.commit()
 
     def _connect_parameters(self):
         pass
@@ -59,10 +157,9 @@ class AutomationComponent(DeviceParameterComponent):
         return parameter.str_for_value(self.parameter_to_value(parameter))
 
     def parameter_to_value(self, parameter):
-        if self._clip and len(self.selected_time) > 0:
-            envelope = self._clip.automation_envelope(parameter)
-            if envelope != None:
-                return self._value_at_time(envelope, self.selected_time[0])
+        session = self._get_edit_session()
+        if session != None:
+            return session.value(parameter)
         return 0.0
 
     def _value_at_time(self, envelope, time_range):
@@ -73,14 +170,9 @@ class AutomationComponent(DeviceParameterComponent):
         index = encoder.index
         parameters = self.parameters
         if 0 <= index < len(parameters) and self._clip and parameters[index]:
-            param = parameters[index]
-            envelope = self._clip.automation_envelope(param)
-            if envelope != None:
-                if param.automation_state == AutomationState.overridden:
-                    param.re_enable_automation()
-                for time_index, time_range in enumerate(self.selected_time):
-                    self._insert_step(time_range, time_index, index, envelope, value)
-
+            session = self._get_edit_session()
+            if session != None and session.add_delta(index, value):
+                self._commit_edits_task.restart()
             self._update_parameter_values()
         return
 
@@ -90,23 +182,3 @@ class AutomationComponent(DeviceParameterComponent):
         parameters = self.parameters
         if 0 <= index < len(parameters) and parameters[index] and self._clip:
             self._clip.view.select_envelope_parameter(parameters[index])
-            self._update_parameter_floats()
-
-    def _update_parameter_floats(self):
-        if self._clip and self.is_enabled():
-            envelopes = [ (self._clip.automation_envelope(param) if param != None else None) for param in self.parameters ]
-            self._parameter_floats = [ [ (self._value_at_time(envelope, step) if envelope != None else 0.0) for envelope in envelopes ] for step in self.selected_time ]
-        else:
-            self._parameter_floats = []
-        return
-
-    def _insert_step(self, time_range, time_index, param_index, envelope, value):
-        param = self.parameters[param_index]
-        envelope_value = self._parameter_floats[time_index][param_index]
-        if param.is_quantized:
-            value_to_insert = clamp(envelope_value + value / EnumerableSetting.STEP_SIZE, param.min, param.max)
-        else:
-            value_range = param.max - param.min
-            value_to_insert = clamp(envelope_value + value * value_range, param.min, param.max)
-        self._parameter_floats[time_index][param_index] = value_to_insert
-        envelope.insert_step(time_range[0], time_range[1] - time_range[0], value_to_insert)
\ No newline at end of file
@@ -7,7 +7,6 @@ from _Framework.Control import ButtonControl
 from _Framework.SubjectSlot import subject_slot, Subject
 from _Framework.ControlSurfaceComponent import ControlSurfaceComponent
 from _Framework.Util import contextmanager, clamp
-from itertools import izip
 
 def create_clip_in_selected_slot(creator, song, clip_length = None):
     """
@@ -315,9 +314,9 @@ class LoopSelectorComponent(ControlSurfaceComponent):
     def _update_page_leds_in_matrix(self, matrix):
         """ update hardware leds to match precomputed map """
         if self.is_enabled() and matrix:
-            for button, color in izip(matrix, self._page_colors):
-                if button:
-                    button.set_light(color)
+            width = matrix.width()
+            colors = self._page_colors
+            matrix.set_frame([ colors[row * width:(row + 1) * width] for row in xrange(matrix.height()) ])
 
     def _jump_to_page(self, next_page):
         start, length = self._get_loop_in_pages()
@@ -1,5 +1,6 @@
 # Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/Push/NoteEditorComponent.py
 from __future__ import with_statement
+from bisect import bisect_left, bisect_right
 from functools import partial
 from itertools import chain, imap, ifilter
 from _Framework.SubjectSlot import subject_slot, Subject
@@ -80,6 +81,14 @@ class TimeStep(object):
     def connected_time_ranges(self):
         return [(self.start - self.offset, self.length)]
 
+    def search_time_ranges(self):
+        """
+        Returns a list of (start_time, length) ranges that contain
+        the start time of every note included in the step, possibly
+        along with some that are not.
+        """
+        return [(self.start - self.offset, self.length)]
+
 
 class LoopingTimeStep(TimeStep):
 
@@ -101,6 +110,9 @@ class LoopingTimeStep(TimeStep):
         else:
             return [(self.start - self.offset, self.length)]
 
+    def search_time_ranges(self):
+        return [(self.start - self.offset, self.length), (self.clip_end - self.offset, self.offset)]
+
     def _looped_time(self, time, extra_time = 0.0):
         if in_range(time, self.clip_end - self.offset, self.clip_end):
             time = time - self.clip_end + self.clip_start
@@ -110,6 +122,39 @@ class LoopingTimeStep(TimeStep):
         return in_range(self._looped_time(time) + self.offset - self.start, 0, self.length) and in_range(time, self.clip_start, self.clip_end)
 
 
+class NoteIndex(object):
+    """
+    Notes of a clip sorted by start time, so that the notes within a
+    step can be found with a binary search instead of filtering all of
+    them.  Results keep the order of the original notes.
+    """
+
+    def __init__(self, notes = (), *a, **k):
+        super(NoteIndex, self).__init__(*a, **k)
+        self._notes = notes
+        self._order = sorted(xrange(len(notes)), key=lambda i: notes[i][1])
+        self._times = [ notes[i][1] for i in self._order ]
+
+    def positions_in_step(self, time_step):
+        """
+        Returns the sorted positions of the notes included in the
+        given time step.
+        """
+        times = self._times
+        positions = set()
+        for start, length in time_step.search_time_ranges():
+            lower = bisect_left(times, start - BEAT_TIME_EPSILON)
+            upper = bisect_right(times, start + length + BEAT_TIME_EPSILON)
+            positions.update(self._order[lower:upper])
+
+        notes = self._notes
+        return [ i for i in sorted(positions) if time_step.includes_note(notes[i]) ]
+
+    def notes_in_step(self, time_step):
+        notes = self._notes
+        return [ notes[i] for i in self.positions_in_step(time_step) ]
+
+
 class NoteEditorComponent(CompoundComponent, Subject):
     __subject_events__ = ('page_length', 'active_steps', 'notes_changed')
 
@@ -135,6 +180,7 @@ class NoteEditorComponent(CompoundComponent, Subject):
         self._modify_all_notes_enabled = False
         self._step_tap_tasks = {}
         self._clip_notes = []
+        self._indexed_clip_notes = NoteIndex()
         self._note_index = 36
         self._grid_resolution = grid_resolution
         self._on_resolution_changed.subject = self._grid_resolution
@@ -250,6 +296,7 @@ class NoteEditorComponent(CompoundComponent, Subject):
             self._clip_notes = self._sequencer_clip.get_notes(time_start, self._note_index, time_length, 1)
         else:
             self._clip_notes = []
+        self._indexed_clip_notes = NoteIndex(self._clip_notes)
         self._update_editor_matrix()
         self.notify_notes_changed()
         return
@@ -266,7 +313,7 @@ class NoteEditorComponent(CompoundComponent, Subject):
         selected_indices = set(map(coords_to_index, self._pressed_steps))
         last_editing_notes = []
         for time_step, index in self._visible_steps():
-            notes = time_step.filter_notes(self._clip_notes)
+            notes = self._indexed_clip_notes.notes_in_step(time_step)
             if len(notes) > 0:
                 last_editing_notes = []
                 if index in selected_indices:
@@ -303,10 +350,9 @@ class NoteEditorComponent(CompoundComponent, Subject):
     def _update_editor_matrix_leds(self):
         """ update hardware LEDS to match offline array values """
         if self.is_enabled() and self._matrix:
-            for row, col in product(xrange(self._height), xrange(self._width)):
-                index = row * self._width + col
-                color = self._step_colors[index]
-                self._matrix.set_light(col, row, color)
+            width = self._width
+            colors = self._step_colors
+            self._matrix.set_frame([ colors[row * width:(row + 1) * width] for row in xrange(self._height) ])
 
     def _get_step_count(self):
         return self._width * self._height
@@ -411,7 +457,7 @@ class NoteEditorComponent(CompoundComponent, Subject):
         if self._sequencer_clip != None:
             x, y = step
             time = self._get_step_start_time(x, y)
-            notes = self._time_step(time).filter_notes(self._clip_notes)
+            notes = self._indexed_clip_notes.notes_in_step(self._time_step(time))
             if notes:
                 if modify_existing:
                     most_significant_velocity = most_significant_note(notes)[3]
@@ -518,11 +564,11 @@ class NoteEditorComponent(CompoundComponent, Subject):
         """ modify all notes in the current pitch """
         return self._modify_notes_in_time(TimeStep(0.0, MAX_CLIP_LENGTH), self._clip_notes)
 
-    def _limited_nudge_offset(self, steps, notes, nudge_offset):
+    def _limited_nudge_offset(self, steps, nudge_offset):
         limited_nudge_offset = MAX_CLIP_LENGTH
         for x, y in steps:
             time_step = self._time_step(self._get_step_start_time(x, y))
-            for note in time_step.filter_notes(notes):
+            for note in self._indexed_clip_notes.notes_in_step(time_step):
                 time_after_nudge = time_step.clamp(note[1], nudge_offset)
                 limited_nudge_offset = min(limited_nudge_offset, abs(note[1] - time_after_nudge))
 
@@ -531,7 +577,7 @@ class NoteEditorComponent(CompoundComponent, Subject):
     def _modify_step_notes(self, steps):
         """ Return a new list with all notes within steps modified. """
         notes = self._clip_notes
-        self._nudge_offset = self._limited_nudge_offset(steps, notes, self._nudge_offset)
+        self._nudge_offset = self._limited_nudge_offset(steps, self._nudge_offset)
         for x, y in steps:
             time_step = self._time_step(self._get_step_start_time(x, y))
             notes = self._modify_notes_in_time(time_step, notes)
@@ -539,9 +585,18 @@ class NoteEditorComponent(CompoundComponent, Subject):
         return notes
 
     def _modify_notes_in_time(self, time_step, notes):
-        step_notes = time_step.filter_notes(self._clip_notes)
-        step_mute = all(map(lambda note: note[4], step_notes))
-        return map(partial(self._modify_single_note, step_mute, time_step), notes)
+        """
+        Returns a new list with the notes in time_step modified.  The
+        passed in notes have to be in the same order as the clip
+        notes, as notes never leave their step when modified.
+        """
+        positions = self._indexed_clip_notes.positions_in_step(time_step)
+        step_mute = all(map(lambda i: self._clip_notes[i][4], positions))
+        notes = list(notes)
+        for i in positions:
+            notes[i] = self._modify_single_note(step_mute, time_step, notes[i])
+
+        return notes
 
     def _modify_single_note(self, step_mute, time_step, (pitch, time, length, velocity, mute)):
         """
@@ -588,7 +643,7 @@ class NoteEditorComponent(CompoundComponent, Subject):
             min_max_values = None
             for x, y in chain(self._modified_steps, self._pressed_steps):
                 start_time = self._get_step_start_time(x, y)
-                min_max_values = self._min_max_for_notes(self._time_step(start_time).filter_notes(self._clip_notes), start_time, min_max_values)
+                min_max_values = self._min_max_for_notes(self._indexed_clip_notes.notes_in_step(self._time_step(start_time)), start_time, min_max_values)
 
             return min_max_values
         return
@@ -1,7 +1,6 @@
 # Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/Push/Push.py
 from __future__ import with_statement
 import Live
-from contextlib import contextmanager
 from functools import partial
 from itertools import imap
 from _Framework.BackgroundComponent import BackgroundComponent, ModifierBackgroundComponent
@@ -87,6 +86,7 @@ class Push(OptimizedControlSurface):
         self._double_press_context = DoublePressContext()
         injecting = inject(double_press_context=const(self._double_press_context), expect_dialog=const(self.expect_dialog), show_notification=const(self.show_notification), selection=lambda : PushSelection(application=self.application(), device_component=self._device_parameter_provider, navigation_component=self._device_navigation))
         self._push_injector = injecting.everywhere()
+        self._selected_track_before_guard = None
         with self.component_guard():
             self._suppress_sysex = False
             self._skin = make_default_skin()
@@ -142,15 +142,19 @@ class Push(OptimizedControlSurface):
         self._send_midi(Sysex.GOOD_BYE_MESSAGE)
         self.log_message('Push script unloaded')
 
-    @contextmanager
-    def component_guard(self):
-        with super(Push, self).component_guard():
-            with self._push_injector:
-                song_view = self.song().view
-                old_selected_track = song_view.selected_track
-                yield
-                if song_view.selected_track != old_selected_track:
-                    self._track_selection_changed_by_action()
+    def _enter_component_guard(self):
+        super(Push, self)._enter_component_guard()
+        self._push_injector.register()
+        self._selected_track_before_guard = self.song().view.selected_track
+
+    def _exit_component_guard(self, succeeded):
+        try:
+            if succeeded and self.song().view.selected_track != self._selected_track_before_guard:
+                self._track_selection_changed_by_action()
+        finally:
+            self._selected_track_before_guard = None
+            self._push_injector.unregister()
+            super(Push, self)._exit_component_guard(succeeded)
 
     def _needs_to_deactivate_session_recording(self):
         return self._matrix_modes.selected_mode == 'note' and self.song().exclusive_arm
@@ -1,4 +1,5 @@
 # Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/RemoteSL/DisplayController.py
+from _Framework.DisplayDataSource import abbreviate_string, STRIP_STRING_REMOVALS
 from RemoteSLComponent import RemoteSLComponent
 from consts import *
 
@@ -7,18 +8,33 @@ class DisplayController(RemoteSLComponent):
     The left and right display can be individually controlled. Both displays will
     show in the upper row a freely defineable string, per strip (the parameter or
     track name). The lower rows will always show parameter values.
+    
+    The rows are only rebuilt when their names or parameter values changed, and
+    only the strips that differ from what was last sent to a row are sent, using
+    the position byte of the text sysex.
     """
 
     def __init__(self, remote_sl_parent):
         RemoteSLComponent.__init__(self, remote_sl_parent)
-        self.__left_strip_names = [ str() for x in range(NUM_CONTROLS_PER_ROW) ]
-        self.__left_strip_parameters = [ None for x in range(NUM_CONTROLS_PER_ROW) ]
-        self.__right_strip_names = [ str() for x in range(NUM_CONTROLS_PER_ROW) ]
-        self.__right_strip_parameters = [ None for x in range(NUM_CONTROLS_PER_ROW) ]
+        self.__strip_names = [None,
+         [ str() for x in range(NUM_CONTROLS_PER_ROW) ],
+         [ str() for x in range(NUM_CONTROLS_PER_ROW) ]]
+        self.__strip_parameters = [None,
+         [ None for x in range(NUM_CONTROLS_PER_ROW) ],
+         [ None for x in range(NUM_CONTROLS_PER_ROW) ]]
+        self.__parameter_listeners = [None, [], []]
+        self.__parameter_strings = [None,
+         [ self.__generate_strip_string('') for x in range(NUM_CONTROLS_PER_ROW) ],
+         [ self.__generate_strip_string('') for x in range(NUM_CONTROLS_PER_ROW) ]]
+        self.__dirty_parameter_strips = [None, set(), set()]
+        self.__dirty_name_rows = set((1, 2))
         self.refresh_state()
         return
 
     def disconnect(self):
+        for side in (1, 2):
+            self.__remove_parameter_listeners(side)
+
         self.__send_clear_displays()
 
     def setup_left_display(self, names, parameters):
@@ -28,10 +44,7 @@ class DisplayController(RemoteSLComponent):
         'names' can be an array of NUM_CONTROLS_PER_ROW strings, or a list with
         exactly one string, which then will fill up the whole display
         """
-        raise len(parameters) == NUM_CONTROLS_PER_ROW or AssertionError
-        raise len(names) == NUM_CONTROLS_PER_ROW or len(names) == 1 or AssertionError
-        self.__left_strip_names = names
-        self.__left_strip_parameters = parameters
+        self.__setup_display(1, names, parameters)
 
     def setup_right_display(self, names, parameters):
         """Shows the given strings on the upper right row, the parameters values
@@ -40,49 +53,72 @@ class DisplayController(RemoteSLComponent):
         'names' can be an array of NUM_CONTROLS_PER_ROW strings, or a list with
         exactly one string, which then will fill up the whole display
         """
-        raise len(parameters) == NUM_CONTROLS_PER_ROW or AssertionError
-        raise len(names) == NUM_CONTROLS_PER_ROW or len(names) == 1 or AssertionError
-        self.__right_strip_names = names
-        self.__right_strip_parameters = parameters
+        self.__setup_display(2, names, parameters)
+
+    def __setup_display(self, side, names, parameters):
+        assert len(parameters) == NUM_CONTROLS_PER_ROW
+        assert len(names) == NUM_CONTROLS_PER_ROW or len(names) == 1
+        if list(names) != list(self.__strip_names[side]):
+            self.__strip_names[side] = list(names)
+            self.__dirty_name_rows.add(side)
+        if list(parameters) != list(self.__strip_parameters[side]):
+            self.__remove_parameter_listeners(side)
+            self.__strip_parameters[side] = list(parameters)
+            self.__add_parameter_listeners(side)
+            self.__dirty_parameter_strips[side].update(range(NUM_CONTROLS_PER_ROW))
+
+    def __add_parameter_listeners(self, side):
+        listeners = []
+        for index, parameter in enumerate(self.__strip_parameters[side]):
+            if parameter:
+                listener = self.__parameter_value_listener(side, index)
+                parameter.add_value_listener(listener)
+                listeners.append((parameter, listener))
+
+        self.__parameter_listeners[side] = listeners
+
+    def __remove_parameter_listeners(self, side):
+        for parameter, listener in self.__parameter_listeners[side]:
+            if parameter != None and parameter.value_has_listener(listener):
+                parameter.remove_value_listener(listener)
+
+        self.__parameter_listeners[side] = []
+
+    def __parameter_value_listener(self, side, index):
+        return lambda : self.__dirty_parameter_strips[side].add(index)
 
     def update_display(self):
-        for row_id in (1, 2, 3, 4):
-            message_string = ''
-            if row_id == 1 or row_id == 2:
-                if row_id == 1:
-                    strip_names = self.__left_strip_names
-                else:
-                    strip_names = self.__right_strip_names
+        for side in (1, 2):
+            if side in self.__dirty_name_rows:
+                strip_names = self.__strip_names[side]
                 if len(strip_names) == NUM_CONTROLS_PER_ROW:
-                    for s in strip_names:
-                        message_string += self.__generate_strip_string(s)
-
+                    message_string = ''.join([ self.__generate_strip_string(s) for s in strip_names ])
                 else:
-                    raise len(strip_names) == 1 or AssertionError
-                    message_string += strip_names[0]
-            else:
-                if row_id == 3 or row_id == 4:
-                    parameters = row_id == 3 and self.__left_strip_parameters
-                else:
-                    parameters = self.__right_strip_parameters
-                if not len(parameters) == NUM_CONTROLS_PER_ROW:
-                    raise AssertionError
-                    for p in parameters:
-                        if p:
-                            message_string += self.__generate_strip_string(unicode(p))
-                        else:
-                            message_string += self.__generate_strip_string('')
+                    assert len(strip_names) == 1
+                    message_string = strip_names[0]
+                self.__send_display_string(message_string, side)
+            if self.__dirty_parameter_strips[side]:
+                parameter_strings = self.__parameter_strings[side]
+                parameters = self.__strip_parameters[side]
+                for index in self.__dirty_parameter_strips[side]:
+                    parameter = parameters[index]
+                    parameter_strings[index] = self.__generate_strip_string(unicode(parameter) if parameter else '')
 
-                else:
-                    raise False or AssertionError
-            self.__send_display_string(message_string, row_id, offset=0)
+                self.__dirty_parameter_strips[side] = set()
+                self.__send_display_string(''.join(parameter_strings), side + 2)
+
+        self.__dirty_name_rows = set()
 
     def refresh_state(self):
-        self.__last_send_row_id_messages = [None,
-         [],
-         [],
-         [],
-         []]
+        self.__row_shadows = [None,
+         None,
+         None,
+         None,
+         None]
+        self.__dirty_name_rows = set((1, 2))
+        for side in (1, 2):
+            self.__dirty_parameter_strips[side].update(range(NUM_CONTROLS_PER_ROW))
+
         return
 
     def __send_clear_displays(self):
@@ -102,76 +138,67 @@ class DisplayController(RemoteSLComponent):
         self.send_midi(start_clear_sysex + left_end_sysex)
         self.send_midi(start_clear_sysex + right_end_sysex)
 
-    def __send_display_string(self, message, row_id, offset = 0):
-        """Sends a sysex to update a complete row.
+    def __send_display_string(self, message, row_id):
+        """Updates a complete row, sending only the strips that differ from what
+        was last sent to it. Changed strips separated by a single unchanged one
+        are sent together, as its characters are cheaper than another sysex.
         
-        'message' must be smaller than NUM_CHARS_PER_DISPLAY_LINE,
-        'offset' can be something form 0 to NUM_CHARS_PER_DISPLAY_LINE - 1
-          (then the text is clipped)
+        'message' is clipped or filled up to NUM_CHARS_PER_DISPLAY_LINE
         
-        'row_id' is defined as followed: left_row1 = 1 | left_row2 = 2
-           left_row1 = 3] | left_row2 = 4
+        'row_id' is defined as followed: left_row1 = 1 | right_row1 = 2
+           left_row2 = 3 | right_row2 = 4
+        """
+        assert row_id in (1, 2, 3, 4)
+        final_message = message[:NUM_CHARS_PER_DISPLAY_LINE].ljust(NUM_CHARS_PER_DISPLAY_LINE)
+        shadow = self.__row_shadows[row_id]
+        if final_message == shadow:
+            return
+        runs = []
+        for strip in range(NUM_CONTROLS_PER_ROW):
+            start = strip * NUM_CHARS_PER_DISPLAY_STRIP
+            end = start + NUM_CHARS_PER_DISPLAY_STRIP
+            if shadow == None or shadow[start:end] != final_message[start:end]:
+                if runs and runs[-1][1] >= start - NUM_CHARS_PER_DISPLAY_STRIP:
+                    runs[-1][1] = end
+                else:
+                    runs.append([start, end])
+
+        for start, end in runs:
+            self.__send_display_text(final_message[start:end], row_id, start)
+
+        self.__row_shadows[row_id] = final_message
+        return
+
+    def __send_display_text(self, text, row_id, offset):
+        """Sends a sysex writing the text to the row, starting at the given
+        character offset.
         """
-        if not row_id in (1, 2, 3, 4):
-            raise AssertionError
-            final_message = ' ' * offset + message
-            if len(final_message) < NUM_CHARS_PER_DISPLAY_LINE:
-                fill_up = NUM_CHARS_PER_DISPLAY_LINE - len(final_message)
-                final_message = final_message + ' ' * fill_up
-            elif len(final_message) >= NUM_CHARS_PER_DISPLAY_LINE:
-                final_message = final_message[0:NUM_CHARS_PER_DISPLAY_LINE]
-            final_offset = 0
-            sysex_header = (240,
-             0,
-             32,
-             41,
-             3,
-             3,
-             18,
-             0,
-             ABLETON_PID,
-             0,
-             2,
-             1)
-            sysex_pos = (final_offset, row_id)
-            sysex_text_command = (4,)
-            sysex_text = tuple([ ord(c) for c in final_message ])
-            sysex_close_up = (247,)
-            full_sysex = sysex_header + sysex_pos + sysex_text_command + sysex_text + sysex_close_up
-            self.__last_send_row_id_messages[row_id] = self.__last_send_row_id_messages[row_id] != full_sysex and full_sysex
-            self.send_midi(full_sysex)
+        sysex_header = (240,
+         0,
+         32,
+         41,
+         3,
+         3,
+         18,
+         0,
+         ABLETON_PID,
+         0,
+         2,
+         1)
+        sysex_pos = (offset, row_id)
+        sysex_text_command = (4,)
+        sysex_text = tuple([ ord(c) for c in text ])
+        sysex_close_up = (247,)
+        self.send_midi(sysex_header + sysex_pos + sysex_text_command + sysex_text + sysex_close_up)
 
     def __generate_strip_string(self, display_string):
-        """ Hack: Shamelessly stolen from the MainDisplayController of the Mackie Control.
-        Should share this in future in a 'Common' package!
-        
-        returns a 6 char string for of the passed string, trying to remove not so important
-        letters and signs first...
+        """ returns a NUM_CHARS_PER_DISPLAY_STRIP char string for of the passed
+        string, trying to remove not so important letters and signs first, using
+        the same rules as the MainDisplayController of the Mackie Control...
         """
         if not display_string:
             return ' ' * NUM_CHARS_PER_DISPLAY_STRIP
-        if len(display_string.strip()) > NUM_CHARS_PER_DISPLAY_STRIP - 1 and display_string.endswith('dB') and display_string.find('.') != -1:
-            display_string = display_string[:-2]
-        if len(display_string) > NUM_CHARS_PER_DISPLAY_STRIP - 1:
-            for um in [' ',
-             'i',
-             'o',
-             'u',
-             'e',
-             'a']:
-                while len(display_string) > NUM_CHARS_PER_DISPLAY_STRIP - 1 and display_string.rfind(um, 1) != -1:
-                    um_pos = display_string.rfind(um, 1)
-                    display_string = display_string[:um_pos] + display_string[um_pos + 1:]
-
-        else:
-            display_string = display_string.center(NUM_CHARS_PER_DISPLAY_STRIP - 1)
-        ret = u''
-        for i in range(NUM_CHARS_PER_DISPLAY_STRIP - 1):
-            if ord(display_string[i]) > 127 or ord(display_string[i]) < 0:
-                ret += ' '
-            else:
-                ret += display_string[i]
-
-        ret += ' '
-        raise len(ret) == NUM_CHARS_PER_DISPLAY_STRIP or AssertionError
+        display_string = abbreviate_string(display_string, NUM_CHARS_PER_DISPLAY_STRIP - 1, STRIP_STRING_REMOVALS, centered=True)
+        ret = u''.join([ (c if 0 <= ord(c) <= 127 else ' ') for c in display_string ]) + ' '
+        assert len(ret) == NUM_CHARS_PER_DISPLAY_STRIP
         return ret
\ No newline at end of file
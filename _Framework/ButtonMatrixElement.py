@@ -1,7 +1,19 @@
 # Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/_Framework/ButtonMatrixElement.py
 from CompoundElement import CompoundElement
+from Proxy import ProxyBase
 from Util import in_range, product, const, slicer, to_slice
 
+def _sent_message(button):
+    """
+    Returns what the control behind button sent last, looking through
+    wrappers, or None when unknown.
+    """
+    while isinstance(button, ProxyBase):
+        button = button.proxied_object
+
+    return getattr(button, '_last_sent_message', None)
+
+
 class ButtonMatrixElement(CompoundElement):
     """
     Class representing a 2-dimensional set of buttons.
@@ -10,6 +22,9 @@ class ButtonMatrixElement(CompoundElement):
     any time by other components. The matrix will automatically block
     messages coming from or sent to a button owned by them, and will
     return None when you try to query it.
+    
+    Components repainting the whole grid can use set_frame, which only
+    sends the cells that changed since the previous frame.
     """
 
     def __init__(self, rows = [], *a, **k):
@@ -17,6 +32,7 @@ class ButtonMatrixElement(CompoundElement):
         self._buttons = []
         self._orig_buttons = []
         self._button_coordinates = {}
+        self._frame = []
         self._max_row_width = 0
         map(self.add_row, rows)
 
@@ -30,6 +46,7 @@ class ButtonMatrixElement(CompoundElement):
 
     def add_row(self, buttons):
         self._buttons.append([None] * len(buttons))
+        self._frame.append([None] * len(buttons))
         self._orig_buttons.append(buttons)
         for index, button in enumerate(buttons):
             self._button_coordinates[button] = (index, len(self._buttons) - 1)
@@ -62,6 +79,41 @@ class ButtonMatrixElement(CompoundElement):
                 button = len(self._buttons[row]) > column and self._buttons[row][column]
                 button and button.set_light(value)
 
+    def set_frame(self, frame, column_offset = 0, row_offset = 0):
+        """
+        Lights the buttons with the values in frame, a sequence of
+        rows of values as accepted by the buttons' set_light.  The
+        frame may cover only a rectangle of the matrix starting at the
+        given offsets, cells outside of it are left untouched.
+        
+        A cell is only sent when its value differs from the one in the
+        last frame, or when its button has sent something else or
+        dropped its send cache since then.  Returns the number of
+        cells sent.
+        """
+        assert column_offset >= 0 and row_offset >= 0
+        changed = []
+        for y, values in enumerate(frame[:self.height() - row_offset], row_offset):
+            buttons = self._buttons[y]
+            committed = self._frame[y]
+            for x, value in enumerate(values[:len(buttons) - column_offset], column_offset):
+                button = buttons[x]
+                if button and committed[x] != (value, button, _sent_message(button)):
+                    changed.append((x, y, button, value))
+
+        for x, y, button, value in changed:
+            button.set_light(value)
+            self._frame[y][x] = (value, button, _sent_message(button))
+
+        return len(changed)
+
+    def invalidate_frame(self):
+        """
+        Makes the next set_frame send every cell it covers.
+        """
+        for row in self._frame:
+            row[:] = [None] * len(row)
+
     def get_button(self, column, row):
         if not in_range(column, 0, self.width()):
             raise AssertionError
@@ -69,6 +121,7 @@ class ButtonMatrixElement(CompoundElement):
             return len(self._buttons[row]) > column and self._buttons[row][column]
 
     def reset(self):
+        self.invalidate_frame()
         for button in self:
             if button:
                 button.reset()
@@ -110,8 +163,10 @@ class ButtonMatrixElement(CompoundElement):
     def on_nested_control_element_grabbed(self, control):
         x, y = self._button_coordinates[control]
         self._buttons[y][x] = control
+        self._frame[y][x] = None
 
     def on_nested_control_element_released(self, control):
         x, y = self._button_coordinates[control]
         self._buttons[y][x] = None
+        self._frame[y][x] = None
         return
\ No newline at end of file
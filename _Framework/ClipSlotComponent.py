@@ -3,17 +3,7 @@ import Live
 from ControlSurfaceComponent import ControlSurfaceComponent
 from Util import in_range
 from SubjectSlot import subject_slot
-
-def find_nearest_color(rgb_table, src_hex_color):
-
-    def hex_to_channels(color_in_hex):
-        return ((color_in_hex & 16711680) >> 16, (color_in_hex & 65280) >> 8, color_in_hex & 255)
-
-    def squared_distance(color):
-        return sum([ (a - b) ** 2 for a, b in zip(hex_to_channels(src_hex_color), hex_to_channels(color[1])) ])
-
-    return min(rgb_table, key=squared_distance)[0]
-
+from ColorTable import find_nearest_color
 
 class ClipSlotComponent(ControlSurfaceComponent):
     """
@@ -0,0 +1,90 @@
+# Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/_Framework/ColorTable.py
+"""
+Nearest color matching for rgb color tables.
+"""
+from collections import OrderedDict
+NEAREST_COLOR_CACHE_SIZE = 512
+MAX_COLOR_TABLES = 16
+
+def hex_to_channels(color_in_hex):
+    return ((color_in_hex & 16711680) >> 16, (color_in_hex & 65280) >> 8, color_in_hex & 255)
+
+
+def _build_tree(entries, depth = 0):
+    if not entries:
+        return None
+    axis = depth % 3
+    entries = sorted(entries, key=lambda entry: entry[0][axis])
+    median = len(entries) / 2
+    return (entries[median],
+     axis,
+     _build_tree(entries[:median], depth + 1),
+     _build_tree(entries[median + 1:], depth + 1))
+
+
+def _search_tree(node, channels, best):
+    if node is None:
+        return best
+    (point, index, value), axis, left, right = node
+    distance = (channels[0] - point[0]) ** 2 + (channels[1] - point[1]) ** 2 + (channels[2] - point[2]) ** 2
+    if (distance, index) < best[:2]:
+        best = (distance, index, value)
+    difference = channels[axis] - point[axis]
+    near, far = (left, right) if difference < 0 else (right, left)
+    best = _search_tree(near, channels, best)
+    if difference * difference <= best[0]:
+        best = _search_tree(far, channels, best)
+    return best
+
+
+class NearestColorTable(object):
+    """
+    Matches colors against an rgb table, a sequence of (value, hex
+    rgb color) pairs, returning the value of the entry nearest to a
+    given color.  The entries are kept in a k-d tree and recent
+    results in a bounded LRU cache.  Results are the same as those of
+    a linear search, ties are resolved in favour of the first entry.
+    """
+    cache_size = NEAREST_COLOR_CACHE_SIZE
+
+    def __init__(self, rgb_table = None, cache_size = None, *a, **k):
+        super(NearestColorTable, self).__init__(*a, **k)
+        if cache_size is not None:
+            self.cache_size = cache_size
+        self.rgb_table = rgb_table
+        self._tree = _build_tree([ (hex_to_channels(color), index, value) for index, (value, color) in enumerate(rgb_table) ])
+        self._cache = OrderedDict()
+        return
+
+    def nearest(self, src_hex_color):
+        cache = self._cache
+        try:
+            value = cache.pop(src_hex_color)
+        except KeyError:
+            value = _search_tree(self._tree, hex_to_channels(src_hex_color), (float('inf'), 0, None))[2]
+            if len(cache) >= self.cache_size:
+                cache.popitem(last=False)
+
+        cache[src_hex_color] = value
+        return value
+
+
+_color_tables = {}
+
+def nearest_color_table(rgb_table):
+    """
+    Returns the shared NearestColorTable for rgb_table, which is
+    identified by object identity.  The cached table is checked to
+    still be built from that very object, as ids of collected tables
+    can be reused.
+    """
+    table = _color_tables.get(id(rgb_table))
+    if table is None or table.rgb_table is not rgb_table:
+        if len(_color_tables) >= MAX_COLOR_TABLES:
+            _color_tables.clear()
+        table = _color_tables[id(rgb_table)] = NearestColorTable(rgb_table)
+    return table
+
+
+def find_nearest_color(rgb_table, src_hex_color):
+    return nearest_color_table(rgb_table).nearest(src_hex_color)
@@ -35,6 +35,10 @@ class OptimizedOwnershipHandler(ElementOwnershipHandler):
             self._ownership_changes[control, client, status] = self._sequence_number
         self._sequence_number += 1
 
+    @property
+    def has_pending_changes(self):
+        return bool(self._ownership_changes)
+
     @depends(log_message=const(print_message), traceback=const(traceback))
     def commit_ownership_changes(self, log_message = None, traceback = None):
         notify = super(OptimizedOwnershipHandler, self).handle_ownership_change
@@ -1,13 +1,12 @@
 # Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/_Framework/ControlSurface.py
 from __future__ import with_statement
 from functools import partial, wraps
-from itertools import chain
 from contextlib import contextmanager
 import traceback
 import Live
 from Profile import profile
 from Dependency import inject
-from Util import BooleanContext, first, find_if, const, in_range
+from Util import BooleanContext, find_if, const, in_range
 from Debug import debug_print
 from ControlElement import OptimizedOwnershipHandler
 from SubjectSlot import SlotManager
@@ -44,6 +43,84 @@ def _scheduled_method(method):
     return wrapper
 
 
+class _ComponentGuard(object):
+    """
+    Context manager returned by ControlSurface.component_guard.  Only
+    the outermost entry sets up the guard, nested entries just count
+    the depth.
+    """
+
+    def __init__(self, control_surface = None, *a, **k):
+        super(_ComponentGuard, self).__init__(*a, **k)
+        self._control_surface = control_surface
+        self.depth = 0
+
+    def __nonzero__(self):
+        return self.depth > 0
+
+    def __enter__(self):
+        self.depth += 1
+        if self.depth == 1:
+            try:
+                self._control_surface._enter_component_guard()
+            except:
+                self.depth = 0
+                raise
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.depth == 1:
+            try:
+                self._control_surface._exit_component_guard(exc_type is None)
+            finally:
+                self.depth = 0
+
+        else:
+            self.depth -= 1
+
+
+class ScheduledMessage(Task.DelayTask):
+    """
+    Task calling the callback of a message scheduled with
+    ControlSurface.schedule_message. Once sent, it is handed back to
+    the control surface to be reused for another message.
+    """
+
+    def __init__(self, on_sent = None, *a, **k):
+        super(ScheduledMessage, self).__init__(*a, **k)
+        self._on_sent = on_sent
+        self._callback = None
+        self._parameter = None
+        return
+
+    def setup(self, delay_in_ticks, callback, parameter = None):
+        self.duration = delay_in_ticks + 1
+        self._callback = callback
+        self._parameter = parameter
+        self.restart()
+
+    def do_update(self, delta):
+        super(ScheduledMessage, self).do_update(delta)
+        if self.is_killed:
+            self.send()
+
+    def send(self):
+        callback, parameter = self._callback, self._parameter
+        self._callback = None
+        self._parameter = None
+        self.kill()
+        try:
+            if parameter:
+                callback(parameter)
+            else:
+                callback()
+        finally:
+            self._on_sent(self)
+
+        return
+
+
 CS_LIST_KEY = 'control_surfaces'
 
 def publish_control_surface(control_surface):
@@ -87,15 +164,25 @@ class ControlSurface(SlotManager):
         self._device_selection_follows_track_selection = False
         self._forwarding_long_identifier_registry = {}
         self._forwarding_registry = {}
+        self._sysex_identifier_lengths = ()
+        self._reported_sysex_overlaps = set()
+        self._forwarding_keys = {}
+        self._forwarded_controls = set()
+        self._remapped_controls = set()
+        self._needs_full_midi_map_rebuild = True
+        self._midi_map_rebuild_count = 0
+        self._reregistered_forwarding_count = 0
+        self._total_reregistered_forwarding_count = 0
         self._is_sending_scheduled_messages = BooleanContext()
         self._remaining_scheduled_messages = []
+        self._scheduled_message_pool = []
         self._task_group = Task.TaskGroup(auto_kill=False)
         self._in_build_midi_map = BooleanContext()
         self._suppress_requests_counter = 0
         self._rebuild_requests_during_suppression = 0
         self._enabled = True
-        self._in_component_guard = BooleanContext()
-        self._accumulate_midi_messages = BooleanContext()
+        self._component_guard = _ComponentGuard(self)
+        self._accumulate_midi_messages = False
         self._midi_message_dict = {}
         self._midi_message_list = []
         self._midi_message_count = 0
@@ -136,6 +223,8 @@ class ControlSurface(SlotManager):
                 control.disconnect()
 
         self._forwarding_registry = None
+        self._forwarding_keys = None
+        self._remapped_controls = None
         self.controls = None
         self._components = None
         self._displays = None
@@ -288,17 +377,23 @@ class ControlSurface(SlotManager):
         """
         pass
 
-    def request_rebuild_midi_map(self):
+    def request_rebuild_midi_map(self, control = None):
         """ Script -> Live.
             When the internal MIDI controller has changed in a way that
             you need to rebuild the MIDI mappings, request a rebuild
             by calling this function This is processed as a request,
             to be sure that its not too often called, because its
             time-critical.
+            Controls pass themselves, so that only their connections
+            are recomputed. Without a control everything is.
         """
-        if not not self._in_build_midi_map:
-            raise AssertionError
-            self._suppress_requests_counter > 0 and self._rebuild_requests_during_suppression += 1
+        assert not self._in_build_midi_map
+        if control is None:
+            self._needs_full_midi_map_rebuild = True
+        else:
+            self._remapped_controls.add(control)
+        if self._suppress_requests_counter > 0:
+            self._rebuild_requests_during_suppression += 1
         else:
             self._c_instance.request_rebuild_midi_map()
 
@@ -310,16 +405,57 @@ class ControlSurface(SlotManager):
             you will never get any MIDI messages at all.
         """
         with self._in_build_midi_map():
-            self._forwarding_registry.clear()
-            self._forwarding_long_identifier_registry.clear()
-            for control in self.controls:
-                if isinstance(control, InputControlElement):
-                    control.install_connections(self._translate_message, partial(self._install_mapping, midi_map_handle), partial(self._install_forwarding, midi_map_handle))
-
+            input_controls = filter(lambda control: isinstance(control, InputControlElement), self.controls)
+            if self._needs_full_midi_map_rebuild or not self._remapped_controls:
+                self._forwarding_registry.clear()
+                self._forwarding_long_identifier_registry.clear()
+                self._forwarding_keys.clear()
+                self._reregistered_forwarding_count = len(input_controls)
+            else:
+                for control in self._remapped_controls:
+                    self._unregister_forwarding(control)
+
+                self._reregistered_forwarding_count = len(self._remapped_controls)
+            install_mapping = partial(self._install_mapping, midi_map_handle)
+            install_forwarding = partial(self._install_forwarding, midi_map_handle)
+            self._forwarded_controls.clear()
+            for control in input_controls:
+                control.install_connections(self._translate_message, install_mapping, install_forwarding)
+
+            for control in self._forwarding_keys.keys():
+                if control not in self._forwarded_controls:
+                    self._unregister_forwarding(control)
+
+            self._sysex_identifier_lengths = tuple(sorted(set(map(len, self._forwarding_long_identifier_registry)), reverse=True))
+            if len(self._sysex_identifier_lengths) > 1:
+                self._report_overlapping_sysex_identifiers()
             if self._pad_translations != None:
                 self._c_instance.set_pad_translation(self._pad_translations)
+            self._remapped_controls.clear()
+            self._needs_full_midi_map_rebuild = False
+            self._midi_map_rebuild_count += 1
+            self._total_reregistered_forwarding_count += self._reregistered_forwarding_count
         return
 
+    @property
+    def midi_map_rebuild_count(self):
+        """ Number of times the MIDI map has been built """
+        return self._midi_map_rebuild_count
+
+    @property
+    def reregistered_forwarding_count(self):
+        """
+        Number of controls re-registered in the forwarding registry in
+        the last build.  The connections of all input controls are
+        still installed on every build, as Live hands in a new MIDI map.
+        """
+        return self._reregistered_forwarding_count
+
+    @property
+    def total_reregistered_forwarding_count(self):
+        """ Number of controls re-registered in the forwarding registry in all builds """
+        return self._total_reregistered_forwarding_count
+
     def toggle_lock(self):
         """ Script -> Live
             Use this function to toggle the script's lock on devices
@@ -388,13 +524,19 @@ class ControlSurface(SlotManager):
         return
 
     def handle_sysex(self, midi_bytes):
-        result = find_if(lambda (id, _): midi_bytes[:len(id)] == id, self._forwarding_long_identifier_registry.iteritems())
-        if result != None:
-            id, control = result
-            control.receive_value(midi_bytes[len(id):-1])
-        else:
-            self.log_message('Got unknown sysex message: ', midi_bytes)
-        return
+        """
+        Forwards the sysex message to the control registered for the
+        longest identifier it starts with, looking up one prefix per
+        registered identifier length.
+        """
+        registry = self._forwarding_long_identifier_registry
+        for length in self._sysex_identifier_lengths:
+            control = registry.get(midi_bytes[:length])
+            if control != None:
+                control.receive_value(midi_bytes[length:-1])
+                return
+
+        self.log_message('Got unknown sysex message: ', midi_bytes)
 
     def set_device_component(self, device_component):
         raise self._device_component == None or AssertionError
@@ -417,13 +559,14 @@ class ControlSurface(SlotManager):
             self._set_suppress_rebuild_requests(False)
 
     def _set_suppress_rebuild_requests(self, suppress_requests):
-        if not not self._in_build_midi_map:
-            raise AssertionError
-            suppress_requests and self._suppress_requests_counter += 1
-        elif not self._suppress_requests_counter > 0:
-            raise AssertionError
+        assert not self._in_build_midi_map
+        if suppress_requests:
+            self._suppress_requests_counter += 1
+        else:
+            assert self._suppress_requests_counter > 0
             self._suppress_requests_counter -= 1
-            self._suppress_requests_counter == 0 and self._rebuild_requests_during_suppression > 0 and self.request_rebuild_midi_map()
+            if self._suppress_requests_counter == 0 and self._rebuild_requests_during_suppression > 0:
+                self._c_instance.request_rebuild_midi_map()
             self._rebuild_requests_during_suppression = 0
 
     def set_pad_translations(self, pad_translations):
@@ -452,31 +595,28 @@ class ControlSurface(SlotManager):
 
     def schedule_message(self, delay_in_ticks, callback, parameter = None):
         """ Schedule a callback to be called after a specified time """
-        if not delay_in_ticks > 0:
-            raise AssertionError
-            if not callable(callback):
-                raise AssertionError
-                self._is_sending_scheduled_messages or delay_in_ticks -= 1
-            message_reference = [None]
-
-            def message(delta):
-                if parameter:
-                    callback(parameter)
-                else:
-                    callback()
-                self._remaining_scheduled_messages.remove(message_reference)
-
-            message_reference[0] = message
-            self._remaining_scheduled_messages.append(message_reference)
-            delay_in_ticks and self._task_group.add(Task.sequence(Task.delay(delay_in_ticks), message))
+        assert delay_in_ticks > 0
+        assert callable(callback)
+        if not self._is_sending_scheduled_messages:
+            delay_in_ticks -= 1
+        if self._scheduled_message_pool:
+            message = self._scheduled_message_pool.pop()
         else:
-            self._task_group.add(message)
-        return
+            message = ScheduledMessage(self._on_scheduled_message_sent)
+        message.setup(delay_in_ticks, callback, parameter)
+        self._remaining_scheduled_messages.append(message)
+        self._task_group.add(message)
+
+    def _on_scheduled_message_sent(self, message):
+        self._remaining_scheduled_messages.remove(message)
+        if message.parent_task:
+            message.parent_task.remove(message)
+        self._scheduled_message_pool.append(message)
 
     def _process_remaining_scheduled_messages(self):
         current_scheduled_messages = tuple(self._remaining_scheduled_messages)
-        for message, in current_scheduled_messages:
-            message(None)
+        for message in current_scheduled_messages:
+            message.send()
 
         return
 
@@ -511,26 +651,48 @@ class ControlSurface(SlotManager):
         component.canonical_parent = self
         return
 
-    @contextmanager
     def component_guard(self):
         """
         Context manager that guards user code.  This prevents
         unnecesary updating and enables several optimisations.  Should
         be used to guard calls to components or control elements.
+        
+        Entering the guard again from within it only counts the
+        nesting depth.
         """
-        if not self._in_component_guard:
-            with self._in_component_guard():
-                with self.setting_listener_caller():
-                    with self._control_surface_injector:
-                        with self.suppressing_rebuild_requests():
-                            with self.accumulating_midi_messages():
-                                yield
-        else:
-            yield
+        return self._component_guard
 
     @property
     def in_component_guard(self):
-        return bool(self._in_component_guard)
+        return self._component_guard.depth > 0
+
+    def _enter_component_guard(self):
+        """
+        Called when entering the outermost component guard.  Override
+        to set up further guarded state after calling super.
+        """
+        self._c_instance.set_listener_caller(self._call_guarded_listener)
+        self._control_surface_injector.register()
+        self._set_suppress_rebuild_requests(True)
+        self._accumulate_midi_messages = True
+
+    def _exit_component_guard(self, succeeded):
+        """
+        Called when leaving the outermost component guard, where
+        succeeded tells whether the guarded code did not raise.
+        Override to tear down further guarded state before calling
+        super.
+        """
+        try:
+            if self._midi_message_count:
+                self._flush_midi_messages()
+        finally:
+            self._accumulate_midi_messages = False
+            try:
+                self._set_suppress_rebuild_requests(False)
+            finally:
+                self._control_surface_injector.unregister()
+                self._c_instance.set_listener_caller(None)
 
     @contextmanager
     def setting_listener_caller(self):
@@ -559,11 +721,13 @@ class ControlSurface(SlotManager):
 
     @contextmanager
     def accumulating_midi_messages(self):
-        with self._accumulate_midi_messages():
-            try:
-                yield
-            finally:
-                self._flush_midi_messages()
+        was_accumulating = self._accumulate_midi_messages
+        self._accumulate_midi_messages = True
+        try:
+            yield
+        finally:
+            self._flush_midi_messages()
+            self._accumulate_midi_messages = was_accumulating
 
     def get_control_by_name(self, control_name):
         return find_if(lambda c: c.name == control_name, self.controls)
@@ -577,26 +741,49 @@ class ControlSurface(SlotManager):
         When optimized=True it is assumed that messages can be
         dropped -- only the last message within an update for a
         given (channel, key) has visible effects.
+        
+        Accumulated messages are flushed in the order of their last
+        write.  An optimized message blanks out the pending one with
+        the same key and is appended, and the list is compacted once
+        blanked entries outnumber pending ones.
         """
         if self._accumulate_midi_messages:
             sysex_status_byte = 240
-            entry = (self._midi_message_count, midi_event_bytes)
+            messages = self._midi_message_list
             if optimized and midi_event_bytes[0] != sysex_status_byte:
-                self._midi_message_dict[midi_event_bytes[0], midi_event_bytes[1]] = entry
-            else:
-                self._midi_message_list.append(entry)
+                key = (midi_event_bytes[0], midi_event_bytes[1])
+                index = self._midi_message_dict.get(key)
+                if index is not None:
+                    messages[index] = None
+                    self._midi_message_count -= 1
+                self._midi_message_dict[key] = len(messages)
+            messages.append(midi_event_bytes)
             self._midi_message_count += 1
+            if len(messages) > 2 * self._midi_message_count:
+                self._compact_midi_messages()
         else:
             self._do_send_midi(midi_event_bytes)
         return True
 
+    def _compact_midi_messages(self):
+        keys = dict(((index, key) for key, index in self._midi_message_dict.iteritems()))
+        messages = []
+        for index, message in enumerate(self._midi_message_list):
+            if message is not None:
+                if index in keys:
+                    self._midi_message_dict[keys[index]] = len(messages)
+                messages.append(message)
+
+        self._midi_message_list = messages
+
     def _flush_midi_messages(self):
-        raise self._accumulate_midi_messages or AssertionError
-        for _, message in sorted(chain(self._midi_message_list, self._midi_message_dict.itervalues()), key=first):
-            self._do_send_midi(message)
+        assert self._accumulate_midi_messages
+        for message in self._midi_message_list:
+            if message is not None:
+                self._do_send_midi(message)
 
         self._midi_message_dict.clear()
-        self._midi_message_list[:] = []
+        self._midi_message_list = []
         self._midi_message_count = 0
 
     def _do_send_midi(self, midi_event_bytes):
@@ -643,28 +830,64 @@ class ControlSurface(SlotManager):
         return success
 
     def _install_forwarding(self, midi_map_handle, control):
-        if not self._in_build_midi_map:
-            raise AssertionError
-            raise control != None or AssertionError
-            if not isinstance(control, InputControlElement):
-                raise AssertionError
-                success = False
-                success = control.message_type() is MIDI_NOTE_TYPE and Live.MidiMap.forward_midi_note(self._c_instance.handle(), midi_map_handle, control.message_channel(), control.message_identifier())
-            elif control.message_type() is MIDI_CC_TYPE:
-                success = Live.MidiMap.forward_midi_cc(self._c_instance.handle(), midi_map_handle, control.message_channel(), control.message_identifier())
-            elif control.message_type() is MIDI_PB_TYPE:
-                success = Live.MidiMap.forward_midi_pitchbend(self._c_instance.handle(), midi_map_handle, control.message_channel())
-            else:
-                raise control.message_type() == MIDI_SYSEX_TYPE or AssertionError
-                success = True
-            forwarding_keys = success and control.identifier_bytes()
-            for key in forwarding_keys:
-                registry = self._forwarding_registry if control.message_type() != MIDI_SYSEX_TYPE else self._forwarding_long_identifier_registry
-                raise key not in registry.keys() or AssertionError, 'Registry key %s registered twice. Check Midi messages!' % str(key)
-                registry[key] = control
-
+        assert self._in_build_midi_map
+        assert control != None
+        assert isinstance(control, InputControlElement)
+        success = False
+        if control.message_type() is MIDI_NOTE_TYPE:
+            success = Live.MidiMap.forward_midi_note(self._c_instance.handle(), midi_map_handle, control.message_channel(), control.message_identifier())
+        elif control.message_type() is MIDI_CC_TYPE:
+            success = Live.MidiMap.forward_midi_cc(self._c_instance.handle(), midi_map_handle, control.message_channel(), control.message_identifier())
+        elif control.message_type() is MIDI_PB_TYPE:
+            success = Live.MidiMap.forward_midi_pitchbend(self._c_instance.handle(), midi_map_handle, control.message_channel())
+        else:
+            assert control.message_type() == MIDI_SYSEX_TYPE
+            success = True
+        if success:
+            self._forwarded_controls.add(control)
+            if control not in self._forwarding_keys:
+                self._register_forwarding(control)
         return success
 
+    def _forwarding_registry_for(self, control):
+        if control.message_type() != MIDI_SYSEX_TYPE:
+            return self._forwarding_registry
+        return self._forwarding_long_identifier_registry
+
+    def _register_forwarding(self, control):
+        forwarding_keys = control.identifier_bytes()
+        registry = self._forwarding_registry_for(control)
+        for key in forwarding_keys:
+            assert registry.get(key, control) is control, 'Registry key %s registered twice. Check Midi messages!' % str(key)
+            registry[key] = control
+
+        self._forwarding_keys[control] = forwarding_keys
+
+    def _report_overlapping_sysex_identifiers(self):
+        """
+        Logs the pairs of sysex identifiers of different controls where
+        one is a prefix of the other, each pair only once.
+        """
+        registry = self._forwarding_long_identifier_registry
+        for identifier, control in registry.iteritems():
+            for length in self._sysex_identifier_lengths:
+                if length < len(identifier):
+                    prefix = identifier[:length]
+                    other_control = registry.get(prefix)
+                    if other_control is not None and other_control is not control and (prefix, identifier) not in self._reported_sysex_overlaps:
+                        self._reported_sysex_overlaps.add((prefix, identifier))
+                        self.log_message('Sysex identifier %s of %s overlaps with %s of %s, the longer one takes precedence' % (str(identifier),
+                         control.name,
+                         str(prefix),
+                         other_control.name))
+
+    def _unregister_forwarding(self, control):
+        forwarding_keys = self._forwarding_keys.pop(control, ())
+        registry = self._forwarding_registry_for(control) if forwarding_keys else None
+        for key in forwarding_keys:
+            if registry.get(key) is control:
+                del registry[key]
+
     def _translate_message(self, type, from_identifier, from_channel, to_identifier, to_channel):
         if not type in (MIDI_CC_TYPE, MIDI_NOTE_TYPE):
             raise AssertionError
@@ -746,9 +969,14 @@ class OptimizedControlSurface(ControlSurface):
         injecting = inject(element_ownership_handler=const(self._optimized_ownership_handler))
         self._ownership_handler_injector = injecting.everywhere()
 
-    @contextmanager
-    def component_guard(self):
-        with super(OptimizedControlSurface, self).component_guard():
-            with self._ownership_handler_injector:
-                yield
-                self._optimized_ownership_handler.commit_ownership_changes()
\ No newline at end of file
+    def _enter_component_guard(self):
+        super(OptimizedControlSurface, self)._enter_component_guard()
+        self._ownership_handler_injector.register()
+
+    def _exit_component_guard(self, succeeded):
+        try:
+            if succeeded and self._optimized_ownership_handler.has_pending_changes:
+                self._optimized_ownership_handler.commit_ownership_changes()
+        finally:
+            self._ownership_handler_injector.unregister()
+            super(OptimizedControlSurface, self)._exit_component_guard(succeeded)
\ No newline at end of file
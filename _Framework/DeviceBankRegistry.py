@@ -7,32 +7,56 @@ given device instances.
 banking to the C++ code is the best mid-term solution.
 """
 from SubjectSlot import Subject
+MIN_COMPACT_SIZE = 32
 
 class DeviceBankRegistry(Subject):
+    """
+    Devices are looked up in a dictionary first. As Live objects are
+    not guaranteed to hash like they compare, a miss falls back to
+    searching for an equal stored device. Entries of deleted devices
+    are dropped once the registry has doubled in size since it was
+    last compacted, so its size stays proportional to the number of
+    existing devices.
+    """
     __subject_events__ = ('device_bank',)
 
     def __init__(self, *a, **k):
         super(DeviceBankRegistry, self).__init__(*a, **k)
         self._device_bank_registry = {}
         self._device_bank_listeners = []
+        self._compact_size = MIN_COMPACT_SIZE
 
     def compact_registry(self):
         newreg = dict(filter(lambda (k, _): k != None, self._device_bank_registry.items()))
         self._device_bank_registry = newreg
+        self._compact_size = max(MIN_COMPACT_SIZE, 2 * len(newreg))
 
     def set_device_bank(self, device, bank):
-        if not self._find_device_bank_key(device):
-            key = device
-            old = self._device_bank_registry[key] if key in self._device_bank_registry else 0
-            self._device_bank_registry[key] = old != bank and bank
+        key = self._find_device_bank_key(device)
+        old = self._device_bank_registry[key] if key is not None else 0
+        if old != bank:
+            if key is None:
+                key = device
+                if len(self._device_bank_registry) >= self._compact_size:
+                    self.compact_registry()
+            self._device_bank_registry[key] = bank
             self.notify_device_bank(device, bank)
 
     def get_device_bank(self, device):
-        return self._device_bank_registry.get(self._find_device_bank_key(device), 0)
+        key = self._find_device_bank_key(device)
+        return self._device_bank_registry[key] if key is not None else 0
 
     def _find_device_bank_key(self, device):
+        if device == None:
+            return None
+        try:
+            if device in self._device_bank_registry:
+                return device
+        except TypeError:
+            pass
+
         for k in self._device_bank_registry.iterkeys():
             if k == device:
                 return k
 
-        return None
\ No newline at end of file
+        return None
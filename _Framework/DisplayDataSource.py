@@ -5,29 +5,69 @@ def adjust_string_crop(original, length):
     return original[:length].ljust(length)
 
 
+ADJUST_STRING_REMOVALS = (' ', '_', 'i', 'o', 'u', 'e', 'a')
+STRIP_STRING_REMOVALS = (' ', 'i', 'o', 'u', 'e', 'a')
+ABBREVIATION_CACHE_SIZE = 1024
+_abbreviations = {}
+
+def abbreviate_string(original, length, removals = ADJUST_STRING_REMOVALS, centered = False):
+    """
+    Brings the string to the given length by either removing
+    characters or adding spaces. When too long, the 'dB' unit of
+    decimal values is dropped first, then the characters in
+    'removals' are removed in that order, from the right and never
+    the first one, and whatever is still too long is cut.  Short
+    strings are padded at the end or, if 'centered', on both sides.
+    
+    Results are memoized in a bounded cache, as displays keep asking
+    for the same few strings.
+    """
+    key = (type(original),
+     original,
+     length,
+     removals,
+     centered)
+    try:
+        return _abbreviations[key]
+    except KeyError:
+        pass
+
+    assert length > 0
+    resulting_string = original
+    if len(resulting_string.strip()) > length and resulting_string.endswith('dB') and resulting_string.find('.') != -1:
+        resulting_string = resulting_string[:-2]
+    if len(resulting_string) > length:
+        excess = len(resulting_string) - length
+        positions = dict(((char, []) for char in removals))
+        for index in xrange(1, len(resulting_string)):
+            char_positions = positions.get(resulting_string[index])
+            if char_positions is not None:
+                char_positions.append(index)
+
+        removed = set()
+        for char in removals:
+            if len(removed) == excess:
+                break
+            removed.update(positions[char][len(removed) - excess:])
+
+        resulting_string = resulting_string[:0].join([ char for index, char in enumerate(resulting_string) if index not in removed ])[:length]
+    elif centered:
+        resulting_string = resulting_string.center(length)
+    else:
+        resulting_string = resulting_string.ljust(length)
+    if len(_abbreviations) >= ABBREVIATION_CACHE_SIZE:
+        _abbreviations.clear()
+    _abbreviations[key] = resulting_string
+    return resulting_string
+
+
 def adjust_string(original, length):
     """
     Brings the string to the given length by either removing
     characters or adding spaces. The algorithm is adopted from ede's
     old implementation for the Mackie.
     """
-    if not length > 0:
-        raise AssertionError
-        resulting_string = original
-        if len(resulting_string) > length:
-            if resulting_string.endswith('dB'):
-                unit_db = resulting_string.find('.') != -1
-                resulting_string = len(resulting_string.strip()) > length and unit_db and resulting_string[:-2]
-            if len(resulting_string) > length:
-                for char in (' ', '_', 'i', 'o', 'u', 'e', 'a'):
-                    offset = 0 if char == ' ' else 1
-                    while len(resulting_string) > length and resulting_string.rfind(char, offset) > 0:
-                        char_pos = resulting_string.rfind(char, offset)
-                        resulting_string = resulting_string[:char_pos] + resulting_string[char_pos + 1:]
-
-                resulting_string = resulting_string[:length]
-        resulting_string = len(resulting_string) < length and resulting_string.ljust(length)
-    return resulting_string
+    return abbreviate_string(original, length)
 
 
 class DisplayDataSource(object):
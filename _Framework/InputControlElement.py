@@ -5,7 +5,7 @@ from Dependency import depends
 from SubjectSlot import SubjectEvent
 from Signal import Signal
 from NotifyingControlElement import NotifyingControlElement
-from Util import in_range, const, nop
+from Util import in_range, const, nop, clamp
 from Debug import debug_print
 from Disconnectable import Disconnectable
 import Task
@@ -23,6 +23,33 @@ MIDI_NOTE_ON_STATUS = 144
 MIDI_NOTE_OFF_STATUS = 128
 MIDI_CC_STATUS = 176
 MIDI_PB_STATUS = 224
+MAX_FEEDBACK_VALUE_MAPS = 8
+_feedback_value_maps = {}
+
+def feedback_value_map(msg_type, curve = None):
+    """
+    Returns the feedback value map for controls of the given message
+    type, passing every value through the optional curve function.
+    Maps are built on first use and shared by all controls.  The
+    cache is emptied once it holds MAX_FEEDBACK_VALUE_MAPS maps, so
+    replaced curves do not keep their maps alive.
+    """
+    key = (msg_type == MIDI_PB_TYPE, curve)
+    value_map = _feedback_value_maps.get(key)
+    if value_map is None:
+        if len(_feedback_value_maps) >= MAX_FEEDBACK_VALUE_MAPS:
+            _feedback_value_maps.clear()
+        max_value = 16383 if msg_type == MIDI_PB_TYPE else 127
+        values = xrange(max_value + 1)
+        if curve is not None:
+            values = [ int(clamp(curve(value), 0, max_value)) for value in values ]
+        if msg_type == MIDI_PB_TYPE:
+            value_map = tuple([ (value >> 7 & 127, value & 127) for value in values ])
+        else:
+            value_map = tuple(values)
+        _feedback_value_maps[key] = value_map
+    return value_map
+
 
 class ParameterSlot(Disconnectable):
     """
@@ -131,6 +158,7 @@ class InputControlElement(NotifyingControlElement):
 
     __subject_events__ = (SubjectEvent(name='value', signal=InputSignal, override=True),)
     _input_signal_listener_count = 0
+    _feedback_curve = None
     num_delayed_messages = 1
     send_depends_on_forwarding = True
 
@@ -143,7 +171,7 @@ class InputControlElement(NotifyingControlElement):
         raise msg_type != MIDI_SYSEX_TYPE or identifier == None or AssertionError
         raise msg_type == MIDI_SYSEX_TYPE or sysex_identifier == None or AssertionError
         super(InputControlElement, self).__init__(*a, **k)
-        self._request_rebuild = request_rebuild_midi_map
+        self._request_rebuild_midi_map = request_rebuild_midi_map
         self._msg_type = msg_type
         self._msg_channel = channel
         self._msg_identifier = identifier
@@ -166,6 +194,9 @@ class InputControlElement(NotifyingControlElement):
         self._report_output = False
         return
 
+    def _request_rebuild(self):
+        self._request_rebuild_midi_map(self)
+
     def message_type(self):
         return self._msg_type
 
@@ -236,18 +267,21 @@ class InputControlElement(NotifyingControlElement):
             self._msg_identifier = self._original_identifier
             self._request_rebuild()
 
-    def _mapping_feedback_values(self):
-        value_map = tuple()
-        if self._mapping_feedback_delay != 0:
-            if self._msg_type != MIDI_PB_TYPE:
-                value_map = tuple(range(128))
-            else:
-                value_pairs = []
-                for value in xrange(16384):
-                    value_pairs.append((value >> 7 & 127, value & 127))
+    def set_feedback_curve(self, curve):
+        """
+        Sets a function mapping the values of the mapped parameter to
+        the values fed back to the control, e.g. to calibrate motor
+        faders.  The curve applies with or without a feedback delay.
+        Controls sharing the curve share its value map.
+        """
+        if self._feedback_curve != curve:
+            self._feedback_curve = curve
+            self._request_rebuild()
 
-                value_map = tuple(value_pairs)
-        return value_map
+    def _mapping_feedback_values(self):
+        if self._mapping_feedback_delay != 0 or self._feedback_curve is not None:
+            return feedback_value_map(self._msg_type, self._feedback_curve)
+        return tuple()
 
     def install_connections(self, install_translation, install_mapping, install_forwarding):
         self._send_delayed_messages_task.kill()
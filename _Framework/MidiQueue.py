@@ -0,0 +1,152 @@
+# Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/_Framework/MidiQueue.py
+"""
+Rate limited output of MIDI messages.
+"""
+from collections import deque
+from Util import const
+import Task
+SYSEX_START = 240
+MESSAGES_PER_TICK = 150
+BYTES_PER_TICK = 3000
+MAX_QUEUE_SIZE = 512
+
+def coalescing_key(midi_bytes):
+    """
+    Returns the key under which a pending message is replaced by a
+    newer one: status and first data byte for short messages, None
+    (never coalesced) for sysex.
+    """
+    if midi_bytes[0] != SYSEX_START and len(midi_bytes) == 3:
+        return midi_bytes[:2]
+    return None
+
+
+class PacedMidiQueue(object):
+    """
+    Sends MIDI to devices that can not digest a burst of messages.
+    Messages go out right away as long as the budget of the current
+    timer tick allows it, otherwise they are queued and drained by a
+    task on the following ticks. A queued message with the same
+    coalescing key as a newer one is replaced in place, so a pad
+    that changes color several times before being sent only gets the
+    latest value. When the queue is full the oldest message is
+    dropped.
+    """
+    messages_per_tick = MESSAGES_PER_TICK
+    bytes_per_tick = BYTES_PER_TICK
+    max_size = MAX_QUEUE_SIZE
+
+    def __init__(self, send_midi = None, messages_per_tick = None, bytes_per_tick = None, max_size = None, key = coalescing_key, *a, **k):
+        super(PacedMidiQueue, self).__init__(*a, **k)
+        assert send_midi is not None
+        self._send_midi = send_midi
+        self._key = key or const(None)
+        if messages_per_tick is not None:
+            self.messages_per_tick = messages_per_tick
+        if bytes_per_tick is not None:
+            self.bytes_per_tick = bytes_per_tick
+        if max_size is not None:
+            self.max_size = max_size
+        self._order = deque()
+        self._pending = {}
+        self._unique_id = 0
+        self._sent_messages = 0
+        self._sent_bytes = 0
+        self.sent_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.max_depth = 0
+        self._drain_task = None
+        return
+
+    def disconnect(self):
+        if self._drain_task is not None:
+            self._drain_task.kill()
+            self._drain_task = None
+        self._order.clear()
+        self._pending.clear()
+        return
+
+    @property
+    def depth(self):
+        return len(self._order)
+
+    def make_drain_task(self):
+        """
+        Returns a task that drains the queue on every timer tick. It
+        has to be added to the task group of the owning script.
+        """
+
+        def drain(delta):
+            self.tick()
+            return Task.RUNNING
+
+        self._drain_task = Task.FuncTask(drain, self.tick)
+        return self._drain_task
+
+    def send(self, midi_bytes):
+        if not self._order and self._has_budget(midi_bytes):
+            self._do_send(midi_bytes)
+        else:
+            self._enqueue(midi_bytes)
+        return True
+
+    def tick(self):
+        """
+        Starts a new budget period and sends as much of the queue as
+        the budget allows.
+        """
+        self._sent_messages = 0
+        self._sent_bytes = 0
+        order = self._order
+        pending = self._pending
+        while order and self._has_budget(pending[order[0]]):
+            self._do_send(pending.pop(order.popleft()))
+
+    def flush(self):
+        """
+        Sends everything that is queued, ignoring the budget. Used
+        when no further ticks are to be expected, i.e. on disconnect.
+        """
+        order = self._order
+        pending = self._pending
+        while order:
+            self._do_send(pending.pop(order.popleft()))
+
+    def reset_statistics(self):
+        self.sent_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.max_depth = len(self._order)
+
+    def _has_budget(self, midi_bytes):
+        """
+        The first message of a tick is always let through, so that a
+        message larger than bytes_per_tick can not block the queue.
+        Its size still counts against the budget of the tick.
+        """
+        if self._sent_messages == 0:
+            return True
+        return self._sent_messages < self.messages_per_tick and self._sent_bytes + len(midi_bytes) <= self.bytes_per_tick
+
+    def _do_send(self, midi_bytes):
+        self._sent_messages += 1
+        self._sent_bytes += len(midi_bytes)
+        self.sent_count += 1
+        self._send_midi(midi_bytes)
+
+    def _enqueue(self, midi_bytes):
+        key = self._key(midi_bytes)
+        if key is None:
+            key = self._unique_id
+            self._unique_id += 1
+        elif key in self._pending:
+            self._pending[key] = midi_bytes
+            self.coalesced_count += 1
+            return
+        if len(self._order) >= self.max_size:
+            del self._pending[self._order.popleft()]
+            self.dropped_count += 1
+        self._order.append(key)
+        self._pending[key] = midi_bytes
+        self.max_depth = max(self.max_depth, len(self._order))
@@ -2,6 +2,7 @@
 from itertools import count
 import Live
 from CompoundComponent import CompoundComponent
+from ColorTable import nearest_color_table
 from SceneComponent import SceneComponent
 from SubjectSlot import subject_slot, subject_slot_group
 from ScrollComponent import ScrollComponent
@@ -308,6 +309,8 @@ class SessionComponent(CompoundComponent):
         matching color for a custom color. The table is used if there is no entry in the
         palette.
         """
+        if color_table is not None:
+            nearest_color_table(color_table)
         for y in xrange(self._num_scenes):
             scene = self.scene(y)
             if not clip_slots_only:
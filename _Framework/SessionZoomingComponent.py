@@ -1,4 +1,5 @@
 # Embedded file name: /Users/versonator/Jenkins/live/Projects/AppLive/Resources/MIDI Remote Scripts/_Framework/SessionZoomingComponent.py
+from itertools import count
 from SubjectSlot import subject_slot, subject_slot_group
 from CompoundComponent import CompoundComponent
 from ScrollComponent import ScrollComponent
@@ -8,34 +9,41 @@ class SessionZoomingComponent(CompoundComponent):
     """
     Class using a matrix of buttons to choose blocks of clips in the
     session, as if you had zoomed out from session.
+    
+    The number of playing clips in every block is kept up to date
+    from the tracks' playing slot index, so that repainting does not
+    need to look at every clip slot.
     """
 
     def __init__(self, session = None, enable_skinning = False, *a, **k):
         super(SessionZoomingComponent, self).__init__(*a, **k)
-        if not session:
-            raise AssertionError
-            self._buttons = None
-            self._zoom_button = None
-            self._scene_bank_buttons = None
-            self._scene_bank_button_slots = self.register_slot_manager()
-            self._scene_bank_index = 0
-            self._is_zoomed_out = False
-            self._empty_value = 0
-            self._stopped_value = 100
-            self._playing_value = 127
-            self._selected_value = 64
-            self._session, self._vertical_scroll, self._horizontal_scroll = self.register_components(session, ScrollComponent(), ScrollComponent())
-            self._vertical_scroll.can_scroll_up = self._can_scroll_up
-            self._vertical_scroll.can_scroll_down = self._can_scroll_down
-            self._vertical_scroll.scroll_up = self._scroll_up
-            self._vertical_scroll.scroll_down = self._scroll_down
-            self._horizontal_scroll.can_scroll_up = self._can_scroll_left
-            self._horizontal_scroll.can_scroll_down = self._can_scroll_right
-            self._horizontal_scroll.scroll_up = self._scroll_left
-            self._horizontal_scroll.scroll_down = self._scroll_right
-            self.register_slot(self._session, self._on_session_offset_changes, 'offset')
-            enable_skinning and self._enable_skinning()
-        return
+        assert session
+        self._buttons = None
+        self._zoom_button = None
+        self._scene_bank_buttons = None
+        self._scene_bank_button_slots = self.register_slot_manager()
+        self._scene_bank_index = 0
+        self._is_zoomed_out = False
+        self._empty_value = 0
+        self._stopped_value = 100
+        self._playing_value = 127
+        self._selected_value = 64
+        self._tracks = []
+        self._playing_scenes = []
+        self._playing_blocks = {}
+        self._session, self._vertical_scroll, self._horizontal_scroll = self.register_components(session, ScrollComponent(), ScrollComponent())
+        self._vertical_scroll.can_scroll_up = self._can_scroll_up
+        self._vertical_scroll.can_scroll_down = self._can_scroll_down
+        self._vertical_scroll.scroll_up = self._scroll_up
+        self._vertical_scroll.scroll_down = self._scroll_down
+        self._horizontal_scroll.can_scroll_up = self._can_scroll_left
+        self._horizontal_scroll.can_scroll_down = self._can_scroll_right
+        self._horizontal_scroll.scroll_up = self._scroll_left
+        self._horizontal_scroll.scroll_down = self._scroll_right
+        self.register_slot(self._session, self._on_session_offset_changes, 'offset')
+        self._rebuild_playing_blocks()
+        if enable_skinning:
+            self._enable_skinning()
 
     def _enable_skinning(self):
         self.set_stopped_value('Zooming.Stopped')
@@ -44,6 +52,11 @@ class SessionZoomingComponent(CompoundComponent):
         self.set_empty_value('Zooming.Empty')
 
     def on_scene_list_changed(self):
+        self._rebuild_playing_blocks()
+        self.update()
+
+    def on_track_list_changed(self):
+        self._rebuild_playing_blocks()
         self.update()
 
     def on_enabled_changed(self):
@@ -111,41 +124,9 @@ class SessionZoomingComponent(CompoundComponent):
             self._session_set_enabled(not self._is_zoomed_out)
             if self.is_enabled():
                 if self._is_zoomed_out and self._buttons != None:
-                    tracks = self._session.tracks_to_use()
-                    scenes = self.song().scenes
-                    slots_registry = [ None for index in range(len(scenes)) ]
-                    width = self._session.width()
-                    height = self._session.height()
-                    for x in range(self._buttons.width()):
-                        for y in range(self._buttons.height()):
-                            value_to_send = self._empty_value
-                            scene_bank_offset = self._scene_bank_index * self._buttons.height() * height
-                            track_offset = x * width
-                            scene_offset = y * height + scene_bank_offset
-                            if track_offset in range(len(tracks)) and scene_offset in range(len(scenes)):
-                                value_to_send = self._stopped_value
-                                if self._session.track_offset() in range(width * (x - 1) + 1, width * (x + 1)) and self._session.scene_offset() - scene_bank_offset in range(height * (y - 1) + 1, height * (y + 1)):
-                                    value_to_send = self._selected_value
-                                else:
-                                    playing = False
-                                    for track in range(track_offset, track_offset + width):
-                                        for scene in range(scene_offset, scene_offset + height):
-                                            if track in range(len(tracks)) and scene in range(len(scenes)):
-                                                if slots_registry[scene] == None:
-                                                    slots_registry[scene] = scenes[scene].clip_slots
-                                                slot = slots_registry[scene][track] if len(slots_registry[scene]) > track else None
-                                                if slot != None and slot.has_clip and slot.clip.is_playing:
-                                                    value_to_send = self._playing_value
-                                                    playing = True
-                                                    break
-
-                                        if playing:
-                                            break
-
-                            if in_range(value_to_send, 0, 128):
-                                self._buttons.send_value(x, y, value_to_send)
-                            else:
-                                self._buttons.set_light(x, y, value_to_send)
+                    for x in xrange(self._buttons.width()):
+                        for y in xrange(self._buttons.height()):
+                            self._update_block(x, y)
 
                 if self._scene_bank_buttons != None:
                     for index, button in enumerate(self._scene_bank_buttons):
@@ -154,7 +135,72 @@ class SessionZoomingComponent(CompoundComponent):
 
         else:
             self._update_requests += 1
-        return
+
+    def _update_block(self, x, y):
+        value_to_send = self._block_value(x, y)
+        if in_range(value_to_send, 0, 128):
+            self._buttons.send_value(x, y, value_to_send)
+        else:
+            self._buttons.set_light(x, y, value_to_send)
+
+    def _block_value(self, x, y):
+        width = self._session.width()
+        height = self._session.height()
+        scene_bank_offset = self._scene_bank_index * self._buttons.height() * height
+        track_offset = x * width
+        scene_offset = y * height + scene_bank_offset
+        if in_range(track_offset, 0, len(self._tracks)) and in_range(scene_offset, 0, len(self.song().scenes)):
+            if in_range(self._session.track_offset(), width * (x - 1) + 1, width * (x + 1)) and in_range(self._session.scene_offset() - scene_bank_offset, height * (y - 1) + 1, height * (y + 1)):
+                return self._selected_value
+            elif self._playing_blocks.get((x, y + self._scene_bank_index * self._buttons.height())):
+                return self._playing_value
+            return self._stopped_value
+        return self._empty_value
+
+    def _playing_scene_index(self, track):
+        index = track.playing_slot_index
+        if index >= 0:
+            slots = track.clip_slots
+            if index < len(slots) and slots[index].has_clip and slots[index].clip.is_playing:
+                return index
+        return None
+
+    def _count_playing_clip(self, track_index, scene_index, delta):
+        block = (track_index / self._session.width(), scene_index / self._session.height())
+        self._playing_blocks[block] = self._playing_blocks.get(block, 0) + delta
+        return block
+
+    def _rebuild_playing_blocks(self):
+        self._tracks = self._session.tracks_to_use()
+        self._on_playing_slot_index_changed.replace_subjects(self._tracks, count())
+        self._playing_scenes = map(self._playing_scene_index, self._tracks)
+        self._playing_blocks = {}
+        for track_index, scene_index in enumerate(self._playing_scenes):
+            if scene_index is not None:
+                self._count_playing_clip(track_index, scene_index, 1)
+
+    @subject_slot_group('playing_slot_index')
+    def _on_playing_slot_index_changed(self, track_index):
+        old_scene_index = self._playing_scenes[track_index]
+        new_scene_index = self._playing_scene_index(self._tracks[track_index])
+        if old_scene_index != new_scene_index:
+            self._playing_scenes[track_index] = new_scene_index
+            changed_blocks = []
+            if old_scene_index is not None:
+                changed_blocks.append(self._count_playing_clip(track_index, old_scene_index, -1))
+            if new_scene_index is not None:
+                changed_blocks.append(self._count_playing_clip(track_index, new_scene_index, 1))
+            for block in set(changed_blocks):
+                self._on_playing_block_changed(*block)
+
+    def _on_playing_block_changed(self, block_x, block_y):
+        if self._allow_updates:
+            if self.is_enabled() and self._is_zoomed_out and self._buttons != None:
+                y = block_y - self._scene_bank_index * self._buttons.height()
+                if in_range(block_x, 0, self._buttons.width()) and in_range(y, 0, self._buttons.height()):
+                    self._update_block(block_x, y)
+        else:
+            self._update_requests += 1
 
     def _on_session_offset_changes(self):
         if self._is_zoomed_out and self._buttons:
@@ -181,7 +227,7 @@ class SessionZoomingComponent(CompoundComponent):
             if value != 0 or not is_momentary:
                 track_offset = x * self._session.width()
                 scene_offset = (y + self._scene_bank_index * self._buttons.height()) * self._session.height()
-                if track_offset in range(len(self._session.tracks_to_use())) and scene_offset in range(len(self.song().scenes)):
+                if in_range(track_offset, 0, len(self._session.tracks_to_use())) and in_range(scene_offset, 0, len(self.song().scenes)):
                     self._session.set_offsets(track_offset, scene_offset)
 
     @subject_slot_group('value')
@@ -190,7 +236,7 @@ class SessionZoomingComponent(CompoundComponent):
             if value != 0 or not sender.is_momentary():
                 button_offset = list(self._scene_bank_buttons).index(sender)
                 scene_offset = button_offset * self._buttons.height() * self._session.height()
-                if scene_offset in range(len(self.song().scenes)):
+                if in_range(scene_offset, 0, len(self.song().scenes)):
                     self._scene_bank_index = button_offset
                     self.update()
 
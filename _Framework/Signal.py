@@ -12,6 +12,7 @@ class Slot(object):
     def __init__(self, callback = None, *a, **k):
         super(Slot, self).__init__(*a, **k)
         self.callback = callback
+        self._connected = False
 
     def __call__(self, *a, **k):
         return self.callback(*a, **k)
@@ -30,6 +31,19 @@ class IdentifyingSlot(Slot):
         self.callback(*(a + (self.sender,)), **k)
 
 
+def _slot_key(callback):
+    """
+    Callbacks are stored by themselves, so bound methods find each
+    other by equality, unless they can not be hashed.
+    """
+    try:
+        hash(callback)
+    except TypeError:
+        return id(callback)
+
+    return callback
+
+
 class Signal(object):
     """
     A signal object implements the observer pattern.  It can be
@@ -39,13 +53,31 @@ class Signal(object):
     The return value of this function will depend on the combiner.
     The combiner takes a generator of slot results and returns a
     value.  The slots whose results are not evaluated are not called.
+    
+    Slots are kept in a dictionary together with their position, so
+    connecting and disconnecting does not depend on the number of
+    slots. Slots may be connected or disconnected while the signal is
+    being called: slots connected meanwhile are called from the next
+    notification on, slots disconnected meanwhile are not called
+    anymore.
     """
 
     def __init__(self, combiner = default_combiner, sender = None, *a, **k):
         super(Signal, self).__init__(*a, **k)
-        self._slots = []
+        self._slots = {}
+        self._first_position = 0
+        self._last_position = 0
+        self._ordered_slots = ()
         self._combiner = combiner
 
+    def _find_slot(self, slot):
+        entry = self._slots.get(_slot_key(slot))
+        if entry == None and isinstance(slot, Slot):
+            entry = self._slots.get(_slot_key(slot.callback))
+            if entry != None and entry[1] is not slot:
+                entry = None
+        return entry
+
     def connect(self, slot, in_front = False, sender = None):
         """
         Connects the signal to the slot. Does nothing if the slot is
@@ -59,38 +91,61 @@ class Signal(object):
         If 'sender' is not None, it will be passed as last ordinal
         parameter to the slot when the signal is dispatched.
         """
-        if not callable(slot):
-            raise AssertionError
-            if slot not in self._slots:
-                slot = IdentifyingSlot(sender, slot) if sender is not None else Slot(slot)
-                in_front and self._slots.insert(0, slot)
+        assert callable(slot)
+        entry = self._find_slot(slot)
+        if entry == None:
+            wrapper = IdentifyingSlot(sender, slot) if sender is not None else Slot(slot)
+            if in_front:
+                self._first_position -= 1
+                position = self._first_position
             else:
-                self._slots.append(slot)
-        else:
-            slot = find_if(lambda x: x == slot, self._slots)
-        return slot
+                self._last_position += 1
+                position = self._last_position
+            wrapper._connected = True
+            self._slots[_slot_key(slot)] = (position, wrapper)
+            self._ordered_slots = None
+            return wrapper
+        return entry[1]
 
     def disconnect(self, slot):
-        if slot in self._slots:
-            self._slots.remove(slot)
+        entry = self._find_slot(slot)
+        if entry != None:
+            wrapper = entry[1]
+            wrapper._connected = False
+            del self._slots[_slot_key(wrapper.callback)]
+            self._ordered_slots = None
 
     def disconnect_all(self):
-        self._slots = []
+        for _, wrapper in self._slots.itervalues():
+            wrapper._connected = False
+
+        self._slots = {}
+        self._ordered_slots = ()
 
     @property
     def count(self):
         return len(self._slots)
 
     def is_connected(self, slot):
-        return slot in self._slots
+        return self._find_slot(slot) != None
 
     def __call__(self, *a, **k):
-        return self._combiner(_slot_notification_generator(self._slots, a, k))
+        slots = self._ordered_slots
+        if slots is None:
+            slots = self._ordered_slots = tuple((wrapper for _, wrapper in sorted(self._slots.itervalues())))
+        if self._combiner is default_combiner:
+            for slot in slots:
+                if slot._connected:
+                    slot(*a, **k)
+
+        else:
+            return self._combiner(_slot_notification_generator(slots, a, k))
 
 
 def _slot_notification_generator(slots, args, kws):
     for slot in slots:
-        yield slot(*args, **kws)
+        if slot._connected:
+            yield slot(*args, **kws)
 
 
 def short_circuit_combiner(slot_results):
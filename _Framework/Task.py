@@ -3,6 +3,8 @@
 Task management.
 """
 import functools
+import heapq
+from bisect import bisect
 from Dependency import depends
 from Util import remove_if, find_if, linear as linear_fn, print_message, const
 import traceback
@@ -14,8 +16,25 @@ class TaskError(Exception):
 KILLED = 0
 RUNNING = 1
 PAUSED = 2
+SLEEP_FOREVER = float('inf')
+
+def _ticks_before(remaining, step):
+    """
+    Returns how many times 'step' can be subtracted from 'remaining',
+    the same way an update does, before it reaches zero.
+    """
+    ticks = 0
+    if step > 0:
+        remaining -= step
+        while remaining > 0:
+            ticks += 1
+            remaining -= step
+
+    return ticks
+
 
 class Task(object):
+    _updates_while_paused = False
 
     def __init__(self, *a, **k):
         super(Task, self).__init__(*a, **k)
@@ -37,27 +56,50 @@ class Task(object):
         self._next.append(task)
         return task
 
+    def _sleep_ticks(self, delta):
+        """
+        Returns the number of following updates with the same delta
+        that will do nothing more than what _skip_ticks does, so the
+        task manager can skip them.
+        """
+        return 0
+
+    def _skip_ticks(self, ticks, delta):
+        pass
+
+    def _wake(self):
+        """
+        Has to be called before changing the state of the task, so the
+        task manager can bring a sleeping task up to date first.
+        """
+        if self._task_manager:
+            self._task_manager._wake_task(self)
+
     def update(self, timer):
         if self._state == RUNNING:
             self.do_update(timer)
         return self._state
 
     def pause(self):
+        self._wake()
         if self._state != KILLED:
             self._state = PAUSED
         return self
 
     def resume(self):
+        self._wake()
         if self._state != KILLED:
             self._state = RUNNING
         return self
 
     def toggle_pause(self):
+        self._wake()
         if self._state != KILLED:
             self._state = RUNNING if self._state == PAUSED else PAUSED
         return self
 
     def restart(self):
+        self._wake()
         self.do_restart()
         self._state = RUNNING
         if self._task_manager and self._task_manager.find(self) == None:
@@ -67,6 +109,7 @@ class Task(object):
         return self
 
     def kill(self):
+        self._wake()
         self._state = KILLED
         if self._task_manager:
             for task in self._next:
@@ -104,6 +147,7 @@ class Task(object):
 
 
 class WrapperTask(Task):
+    _updates_while_paused = True
 
     def __init__(self, wrapped_task = None, *a, **k):
         super(WrapperTask, self).__init__(*a, **k)
@@ -124,7 +168,7 @@ class WrapperTask(Task):
 class FuncTask(Task):
 
     def __init__(self, func = None, equivalent = None, *a, **k):
-        raise func != None or AssertionError
+        assert func != None
         super(FuncTask, self).__init__(*a, **k)
         self._func = func
         self._equivalent = equivalent
@@ -156,7 +200,7 @@ class GeneratorTask(Task):
         delta = 0
 
     def __init__(self, generator = None, equivalent = None, *a, **k):
-        raise generator != None and callable(generator) or AssertionError
+        assert generator != None and callable(generator)
         super(GeneratorTask, self).__init__(*a, **k)
         self._param = GeneratorTask.Param()
         self._set_generator(generator)
@@ -190,6 +234,12 @@ class GeneratorTask(Task):
 
 
 class TaskGroup(Task):
+    """
+    Updates its child tasks in the order they were added. Children
+    are only visited while they have something to do: paused children
+    are left alone until they are resumed, and children waiting for
+    some time sleep in a heap of wake up ticks until then.
+    """
     auto_kill = True
     auto_remove = True
     loop = False
@@ -203,6 +253,16 @@ class TaskGroup(Task):
         if loop is not None:
             self.loop = loop
         self._tasks = []
+        self._orders = {}
+        self._next_order = 0
+        self._active = []
+        self._active_tasks = set()
+        self._sleeping = {}
+        self._wake_heap = []
+        self._sleep_count = 0
+        self._sleep_delta = None
+        self._ticks = 0
+        self._update_index = None
         for task in tasks:
             self.add(task)
 
@@ -213,14 +273,34 @@ class TaskGroup(Task):
             t._set_parent(None)
 
         self._tasks = []
+        self._orders = {}
+        self._active = []
+        self._active_tasks = set()
+        self._sleeping = {}
+        self._wake_heap = []
         super(TaskGroup, self).clear()
         return
 
     @depends(log_message=const(print_message), traceback=const(traceback))
     def do_update(self, timer, log_message = None, traceback = None):
         super(TaskGroup, self).do_update(timer)
-        for task in self._tasks:
-            if not task.is_killed:
+        self._ticks += 1
+        self._update_index = 0
+        if timer != self._sleep_delta:
+            for task in self._sleeping.keys():
+                self._wake_task(task)
+
+            self._wake_heap = []
+            self._sleep_delta = timer
+        while self._wake_heap and self._wake_heap[0][0] <= self._ticks:
+            wake_tick, _, task = heapq.heappop(self._wake_heap)
+            if self._sleeping.get(task, (None, None))[1] == wake_tick:
+                self._wake_task(task)
+
+        while self._update_index < len(self._active):
+            order, task = self._active[self._update_index]
+            self._update_index += 1
+            if not task.is_killed and self._orders.get(task) == order:
                 try:
                     task.update(timer)
                 except Exception:
@@ -228,24 +308,86 @@ class TaskGroup(Task):
                     log_message('Error when executing task')
                     traceback.print_exc()
 
-        if self.auto_remove:
+                if task.is_running and self._orders.get(task) == order:
+                    ticks = task._sleep_ticks(timer)
+                    if ticks > 0:
+                        self._sleep(task, ticks)
+
+        self._update_index = None
+        killed = [ task for order, task in self._active if task.is_killed and self._orders.get(task) == order ]
+        self._active = filter(self._stays_active, self._active)
+        self._active_tasks = set((task for _, task in self._active))
+        if self.auto_remove and killed:
+            for task in filter(lambda t: t.is_killed, self._tasks):
+                del self._orders[task]
+
             self._tasks = remove_if(lambda t: t.is_killed, self._tasks)
-        all_killed = len(filter(lambda t: t.is_killed, self._tasks)) == self.count
+        all_killed = not self._active and not self._sleeping and find_if(lambda t: not t.is_killed, self._tasks) == None
         if self.auto_kill and all_killed:
             self.kill()
         elif self.loop and all_killed:
             self.restart()
 
+    def _stays_active(self, (order, task)):
+        return self._orders.get(task) == order and not task.is_killed and task not in self._sleeping and (task.is_running or task._updates_while_paused)
+
+    def _activate(self, task):
+        """
+        Puts the task back into the list of tasks to update, returning
+        whether it will still be updated in the current update.
+        """
+        entry = (self._orders[task], task)
+        index = bisect(self._active, entry)
+        self._active.insert(index, entry)
+        self._active_tasks.add(task)
+        if self._update_index is not None and index < self._update_index:
+            self._update_index += 1
+            return False
+        return self._update_index is not None
+
+    def _sleep(self, task, ticks):
+        wake_tick = self._ticks + ticks + 1
+        self._sleeping[task] = (self._ticks, wake_tick)
+        heapq.heappush(self._wake_heap, (wake_tick, self._sleep_count, task))
+        self._sleep_count += 1
+
+    def _wake_task(self, task):
+        if task in self._orders and (task not in self._active_tasks or task in self._sleeping):
+            self._wake()
+            updated_now = False
+            if task not in self._active_tasks:
+                updated_now = self._activate(task)
+            if task in self._sleeping:
+                start_tick, _ = self._sleeping.pop(task)
+                task._skip_ticks(self._ticks - start_tick - int(updated_now), self._sleep_delta)
+
+    def _sleep_ticks(self, delta):
+        if self._active:
+            return 0
+        elif self._wake_heap:
+            return self._wake_heap[0][0] - self._ticks - 1
+        return SLEEP_FOREVER
+
+    def _skip_ticks(self, ticks, delta):
+        self._ticks += ticks
+
     def add(self, task):
         task = totask(task)
         task._set_parent(self)
+        self._wake()
         self._tasks.append(task)
+        self._orders[task] = self._next_order
+        self._next_order += 1
+        self._activate(task)
         if self.is_killed:
             super(TaskGroup, self).restart()
         return task
 
     def remove(self, task):
         self._tasks.remove(task)
+        del self._orders[task]
+        self._active_tasks.discard(task)
+        self._sleeping.pop(task, None)
         task._set_parent(None)
         return
 
@@ -282,6 +424,13 @@ class WaitTask(Task):
     def do_restart(self):
         self.remaining = self.duration
 
+    def _sleep_ticks(self, delta):
+        return _ticks_before(self.remaining, delta)
+
+    def _skip_ticks(self, ticks, delta):
+        for _ in xrange(ticks):
+            self.remaining -= delta
+
 
 class DelayTask(Task):
     duration = 1
@@ -303,6 +452,12 @@ class DelayTask(Task):
             self.kill()
             self.remaining = 0
 
+    def _sleep_ticks(self, delta):
+        return _ticks_before(self.remaining, 1)
+
+    def _skip_ticks(self, ticks, delta):
+        self.remaining -= ticks
+
 
 class TimerTask(WaitTask):
 
@@ -313,6 +468,9 @@ class TimerTask(WaitTask):
         else:
             self.on_tick()
 
+    def _sleep_ticks(self, delta):
+        return 0
+
     def on_tick(self):
         pass
 
@@ -372,6 +530,14 @@ class SequenceTask(Task):
                 self._advance_sequence()
         return
 
+    def _sleep_ticks(self, delta):
+        if self._current is not None and self._current.is_running:
+            return self._current._sleep_ticks(delta)
+        return 0
+
+    def _skip_ticks(self, ticks, delta):
+        self._current._skip_ticks(ticks, delta)
+
     def do_restart(self):
         for x in self._tasks:
             x.restart()
@@ -460,6 +460,7 @@ BANK_NAME_DICT = {'AudioEffectGroupDevice': RCK_BNK_NAMES,
  'GlueCompressor': GLU_BNK_NAMES,
  'AutoFilter': AFL_BNK_NAMES}
 MAX_DEVICES = ('MxDeviceInstrument', 'MxDeviceAudioEffect', 'MxDeviceMidiEffect')
+PLUGIN_DEVICES = ('PluginDevice', 'AuPluginDevice')
 
 def device_parameters_to_map(device):
     return tuple(device.parameters[1:])
@@ -503,11 +504,7 @@ def parameter_banks(device, device_dict = DEVICE_DICT):
     """ Determine the parameters to use for a device """
     if device != None:
         if device.class_name in device_dict.keys():
-
-            def names_to_params(bank):
-                return map(partial(get_parameter_by_name, device), bank)
-
-            return map(names_to_params, device_dict[device.class_name])
+            return [ get_parameters_by_name(device, bank) for bank in device_dict[device.class_name] ]
         else:
             if device.class_name in MAX_DEVICES:
                 try:
@@ -536,10 +533,10 @@ def parameter_banks(device, device_dict = DEVICE_DICT):
 
 def best_of_parameter_bank(device, device_bob_dict = DEVICE_BOB_DICT):
     bobs = device and device.class_name in device_bob_dict and device_bob_dict[device.class_name]
-    if not len(bobs) == 1:
-        raise AssertionError
-        return map(partial(get_parameter_by_name, device), bobs[0])
-    if device.class_name in MAX_DEVICES:
+    if bobs:
+        assert len(bobs) == 1
+        return get_parameters_by_name(device, bobs[0])
+    if device and device.class_name in MAX_DEVICES:
         try:
             parameter_indices = device.get_bank_parameters(-1)
             return [ (device.parameters[i] if i != -1 else None) for i in parameter_indices ]
@@ -569,10 +566,78 @@ def number_of_parameter_banks(device, device_dict = DEVICE_DICT):
     return 0
 
 
-def get_parameter_by_name(device, name):
-    """ Find the given device's parameter that belongs to the given name """
-    for i in device.parameters:
+class ParameterLayout(object):
+    """
+    Indices of the parameters of a device class by their name. The
+    indices of the banks that have been resolved are kept as well, so
+    that a bank is resolved in time proportional to its size. Only
+    used for the built-in devices, whose parameters are the same for
+    every instance of a class.
+    """
+
+    def __init__(self, parameters, *a, **k):
+        super(ParameterLayout, self).__init__(*a, **k)
+        self.size = len(parameters)
+        self._indices = {}
+        self._bank_indices = {}
+        for index, parameter in enumerate(parameters):
+            self._indices.setdefault(parameter.original_name, index)
+
+    def bank_indices(self, names):
+        try:
+            return self._bank_indices[names]
+        except KeyError:
+            indices = self._bank_indices[names] = tuple([ self._indices.get(name) for name in names ])
+            return indices
+
+
+_parameter_layouts = {}
+
+def parameter_layout(device, parameters = None):
+    """ Returns the ParameterLayout of the given device's class """
+    if parameters == None:
+        parameters = device.parameters
+    layout = _parameter_layouts.get(device.class_name)
+    if layout == None or layout.size != len(parameters):
+        layout = _parameter_layouts[device.class_name] = ParameterLayout(parameters)
+    return layout
+
+
+def get_parameters_by_name(device, names):
+    """ Find the given device's parameters that belong to the given names """
+    names = tuple(names)
+    parameters = device.parameters
+    if device.class_name in MAX_DEVICES + PLUGIN_DEVICES:
+        return map(partial(_find_parameter, parameters), names)
+    result = _parameters_from_layout(parameter_layout(device, parameters), parameters, names)
+    if result == None:
+        layout = _parameter_layouts[device.class_name] = ParameterLayout(parameters)
+        result = _parameters_from_layout(layout, parameters, names)
+    return result
+
+
+def _parameters_from_layout(layout, parameters, names):
+    """ Returns None if the layout turns out not to match the parameters """
+    result = []
+    for name, index in zip(names, layout.bank_indices(names)):
+        if index == None:
+            result.append(None)
+        elif parameters[index].original_name == name:
+            result.append(parameters[index])
+        else:
+            return None
+
+    return result
+
+
+def _find_parameter(parameters, name):
+    for i in parameters:
         if i.original_name == name:
             return i
 
-    return None
\ No newline at end of file
+    return None
+
+
+def get_parameter_by_name(device, name):
+    """ Find the given device's parameter that belongs to the given name """
+    return get_parameters_by_name(device, (name,))[0]
\ No newline at end of file
@@ -2,7 +2,7 @@
 import sys
 from _Tools import types
 from MxDUtils import TupleWrapper
-from LomTypes import TUPLE_TYPES, PROPERTY_TYPES, ENUM_TYPES, ROOT_KEYS, HIDDEN_TYPES, HIDDEN_PROPERTIES, LomObjectError, LomAttributeError, is_class, get_root_prop, is_lom_object, is_cplusplus_lom_object, is_object_iterable
+from LomTypes import TUPLE_TYPES, PROPERTY_TYPES, ENUM_TYPES, ROOT_KEYS, HIDDEN_TYPES, HIDDEN_PROPERTIES, THIS_DEVICE, LomObjectError, LomAttributeError, is_class, get_root_prop, is_lom_object, is_cplusplus_lom_object, is_object_iterable
 
 class LomInformation(object):
     """ Class that extracts information from a given LOM object """
@@ -128,10 +128,109 @@ class LomIntrospection(object):
                 pass
 
 
+SORTED_TUPLE_KEYS = tuple(sorted(TUPLE_TYPES.keys()))
+
+def listenable_property_for(prop_name):
+    return 'has_clip' if prop_name == 'clip' else prop_name
+
+
+def find_child_index(parent, prop_name, lom_object):
+    children = getattr(parent, prop_name)
+    if lom_object in children:
+        return list(children).index(lom_object)
+    return None
+
+
+class LomPathCache(object):
+    """
+    Speeds up the path calculation. Keeps the paths of objects by
+    their LOM id and, for every list of children that has been
+    searched, a map from child to index. Listeners on all the
+    properties the paths were derived from invalidate everything
+    once the structure of the set changes.
+    """
+
+    def __init__(self, *a, **k):
+        super(LomPathCache, self).__init__(*a, **k)
+        self._paths = {}
+        self._child_indices = {}
+        self._observed_properties = []
+        self._is_valid = True
+        self._structure_listener = self._on_structure_changed
+
+    def disconnect(self):
+        self.clear()
+
+    def clear(self):
+        for lom_object, prop_name in self._observed_properties:
+            if lom_object != None and getattr(lom_object, prop_name + '_has_listener')(self._structure_listener):
+                getattr(lom_object, 'remove_%s_listener' % prop_name)(self._structure_listener)
+
+        self._paths = {}
+        self._child_indices = {}
+        self._observed_properties = []
+        self._is_valid = True
+
+    def _on_structure_changed(self):
+        self._is_valid = False
+
+    def _validate(self):
+        if not self._is_valid:
+            self.clear()
+
+    def get_path(self, lom_id):
+        self._validate()
+        return self._paths.get(lom_id)
+
+    def set_path(self, lom_id, path_components):
+        self._paths[lom_id] = tuple(path_components)
+
+    def observe(self, parent, prop_name):
+        """ Invalidates the cache once the given property of parent changes """
+        prop_name = listenable_property_for(prop_name)
+        if hasattr(parent, prop_name + '_has_listener') and not getattr(parent, prop_name + '_has_listener')(self._structure_listener):
+            getattr(parent, 'add_%s_listener' % prop_name)(self._structure_listener)
+            self._observed_properties.append((parent, prop_name))
+
+    def child_index(self, parent, prop_name, lom_object):
+        """ Returns the index of lom_object in the given list property of parent, or None """
+        self._validate()
+        key = (parent, prop_name)
+        try:
+            indices = self._child_indices[key]
+        except KeyError:
+            indices = self._child_indices[key] = self._make_child_indices(parent, prop_name)
+        except TypeError:
+            indices = None
+
+        if indices != None:
+            try:
+                index = indices.get(lom_object)
+            except TypeError:
+                index = None
+
+            if index != None:
+                return index
+        return find_child_index(parent, prop_name, lom_object)
+
+    def _make_child_indices(self, parent, prop_name):
+        self.observe(parent, prop_name)
+        indices = {}
+        try:
+            for index, child in enumerate(getattr(parent, prop_name)):
+                indices.setdefault(child, index)
+
+        except TypeError:
+            indices = None
+
+        return indices
+
+
 class LomPathCalculator(object):
 
-    def __init__(self, lom_object, external_device, *a, **k):
+    def __init__(self, lom_object, external_device, path_cache = None, *a, **k):
         super(LomPathCalculator, self).__init__(*a, **k)
+        self._path_cache = path_cache
         self._path_components = self._calculate_path(lom_object, external_device)
 
     @property
@@ -158,6 +257,8 @@ class LomPathCalculator(object):
         for key in PROPERTY_TYPES.keys():
             if isinstance(lom_object, PROPERTY_TYPES[key]):
                 if hasattr(parent, key):
+                    if self._path_cache != None:
+                        self._path_cache.observe(parent, key)
                     component = lom_object == getattr(parent, key) and key
                     break
 
@@ -165,11 +266,13 @@ class LomPathCalculator(object):
 
     def _find_tuple_element_object_path(self, lom_object, parent):
         component = None
-        for key in sorted(list(TUPLE_TYPES.keys())):
+        for key in SORTED_TUPLE_KEYS:
             if hasattr(parent, key):
-                property = getattr(parent, key)
-                if lom_object in property:
-                    index = list(property).index(lom_object)
+                if self._path_cache != None:
+                    index = self._path_cache.child_index(parent, key, lom_object)
+                else:
+                    index = find_child_index(parent, key, lom_object)
+                if index != None:
                     component = u'%s %d' % (key, index)
                     break
 
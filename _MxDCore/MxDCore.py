@@ -4,8 +4,8 @@ from functools import partial
 import _Framework
 from _Framework.Debug import debug_print
 from MxDUtils import TupleWrapper, StringHandler
-from LomUtils import LomInformation, LomIntrospection, LomPathCalculator, LomPathResolver
-from LomTypes import ENUM_TYPES, PROPERTY_TYPES, CONTROL_SURFACES, ROOT_KEYS, LomNoteOperationWarning, LomNoteOperationError, LomAttributeError, LomObjectError, get_root_prop, is_lom_object, is_cplusplus_lom_object, is_object_iterable, verify_object_property
+from LomUtils import LomInformation, LomIntrospection, LomPathCache, LomPathCalculator, LomPathResolver
+from LomTypes import ENUM_TYPES, PROPERTY_TYPES, CONTROL_SURFACES, THIS_DEVICE, ROOT_KEYS, LomNoteOperationWarning, LomNoteOperationError, LomAttributeError, LomObjectError, get_root_prop, is_lom_object, is_cplusplus_lom_object, is_object_iterable, verify_object_property
 
 def get_current_max_device(device_id):
     raise MxDCore.instance != None and MxDCore.instance.manager != None or AssertionError
@@ -40,6 +40,14 @@ def parameter_to_bool(parameter):
     return bool_value
 
 
+def compares_by_identity(obj):
+    for cls in type(obj).__mro__:
+        if cls is not object and ('__eq__' in vars(cls) or '__cmp__' in vars(cls)):
+            return False
+
+    return True
+
+
 def note_from_parameters(parameters):
     new_note = [parameters[0], parameters[1], parameters[2]]
     new_note.append(int(parameters[3]) if len(parameters) > 3 and isinstance(parameters[3], (int, float)) else 100)
@@ -68,6 +76,10 @@ class MxDCore(object):
         self.lom_classes += LomIntrospection(Live, exclude=excluded).lom_classes
         self.lom_classes += LomIntrospection(_Framework).lom_classes
         self.appointed_lom_ids = {0: None}
+        self._appointed_lom_ids_by_object = {None: 0}
+        self._objects_by_lom_id = {}
+        self._lom_id_by_object = {}
+        self._path_cache = LomPathCache()
         return
 
     def disconnect(self):
@@ -77,9 +89,13 @@ class MxDCore(object):
                 self.release_device_context(dev_id, -1, '')
 
         TupleWrapper.forget_tuple_wrapper_instances()
+        self._path_cache.disconnect()
         self.manager.set_manager_callbacks(None, None, None, None)
         self.manager = None
         del self.appointed_lom_ids
+        del self._appointed_lom_ids_by_object
+        del self._objects_by_lom_id
+        del self._lom_id_by_object
         del self.lom_classes
         return
 
@@ -100,36 +116,75 @@ class MxDCore(object):
     def _get_lom_id_by_lom_object(self, lom_object):
         if is_cplusplus_lom_object(lom_object):
             return self.manager.get_lom_id(lom_object)
-        for id, object in self.appointed_lom_ids.iteritems():
-            if object == lom_object:
-                return id
+        try:
+            return self._appointed_lom_ids_by_object[lom_object]
+        except (KeyError, TypeError):
+            pass
+
+        id = None
+        if not compares_by_identity(lom_object):
+            for appointed_id, object in self.appointed_lom_ids.iteritems():
+                if object == lom_object:
+                    id = appointed_id
+                    break
+
+        if id is None:
+            id = -len(self.appointed_lom_ids)
+            self.appointed_lom_ids[id] = lom_object
+        try:
+            self._appointed_lom_ids_by_object[lom_object] = id
+        except TypeError:
+            pass
 
-        id = -len(self.appointed_lom_ids)
-        self.appointed_lom_ids[id] = lom_object
         return id
 
     def _get_lom_id_observers_and_remotes(self, lom_id):
         """returns a list of (device_id, object_id) tuples that observe the given lom_id"""
-        raise lom_id != 0 or AssertionError
-        observers = []
-        remotes = []
-        for device_id, device_context in self.device_contexts.iteritems():
-            for object_id, _ in device_context.iteritems():
-                if not isinstance(object_id, int):
-                    continue
-                type = self._get_current_type(device_id, object_id)
-                if type == 'obs':
-                    if self._get_current_lom_id(device_id, object_id) == int(lom_id):
-                        observers.append((device_id, object_id))
-                elif type == 'rmt':
-                    if self._get_current_lom_id(device_id, object_id) == int(lom_id):
-                        remotes.append((device_id, object_id))
-
-        return (observers, remotes)
+        assert lom_id != 0
+        objects = self._objects_by_lom_id.get(int(lom_id), {})
+        return (list(objects.get('obs', ())), list(objects.get('rmt', ())))
+
+    def _update_lom_id_index(self, device_id, object_id):
+        """files the obj/obs/rmt object under its current lom_id and type"""
+        key = (device_id, object_id)
+        entry = (self._get_current_lom_id(device_id, object_id), self._get_current_type(device_id, object_id))
+        if self._lom_id_by_object.get(key) != entry:
+            self._remove_from_lom_id_index(device_id, object_id)
+            lom_id, type = entry
+            if lom_id != 0 and type is not None:
+                self._objects_by_lom_id.setdefault(lom_id, {}).setdefault(type, set()).add(key)
+                self._lom_id_by_object[key] = entry
+
+    def _remove_from_lom_id_index(self, device_id, object_id):
+        key = (device_id, object_id)
+        if key in self._lom_id_by_object:
+            lom_id, type = self._lom_id_by_object.pop(key)
+            objects = self._objects_by_lom_id[lom_id]
+            objects[type].discard(key)
+            if not objects[type]:
+                del objects[type]
+                if not objects:
+                    del self._objects_by_lom_id[lom_id]
+
+    def lom_id_observer_count(self, lom_id):
+        """returns the number of live.observer objects observing the given lom_id"""
+        return len(self._objects_by_lom_id.get(int(lom_id), {}).get('obs', ()))
+
+    def lom_id_remote_count(self, lom_id):
+        """returns the number of live.remote~ objects controlling the given lom_id"""
+        return len(self._objects_by_lom_id.get(int(lom_id), {}).get('rmt', ()))
 
     def _get_object_path(self, device_id, lom_object):
-        resolver = LomPathCalculator(lom_object, get_current_max_device(device_id))
-        return concatenate_strings(resolver.path_components)
+        lom_id = None
+        path_components = None
+        if is_cplusplus_lom_object(lom_object):
+            lom_id = self.manager.get_lom_id(lom_object)
+            path_components = self._path_cache.get_path(lom_id)
+        if path_components == None:
+            path_components = LomPathCalculator(lom_object, get_current_max_device(device_id), self._path_cache).path_components
+            if lom_id != None and THIS_DEVICE not in path_components[:1]:
+                self._path_cache.set_path(lom_id, path_components)
+        return concatenate_strings(path_components)
 
     def _is_integer(self, s):
         if s[0] in ('-', '+'):
@@ -145,6 +200,7 @@ class MxDCore(object):
                 self._observer_update_listener(device_id, object_id)
             elif type == 'rmt':
                 self._remote_update_timeable(device_id, object_id, True)
+        self._update_lom_id_index(device_id, object_id)
 
     def _get_current_lom_id(self, device_id, object_id):
         """get the CURRENT_LOM_ID of obj/obs/rmt objects"""
@@ -161,6 +217,7 @@ class MxDCore(object):
                 self.device_contexts[device_id][object_id][TYPE_KEY] = type
         else:
             self.device_contexts[device_id][object_id][TYPE_KEY] = type
+        self._update_lom_id_index(device_id, object_id)
         return
 
     def _get_current_type(self, device_id, object_id):
@@ -207,6 +264,7 @@ class MxDCore(object):
         for key in device_context.keys():
             if isinstance(key, int):
                 object_context = device_context[key]
+                self._remove_from_lom_id_index(device_id, key)
                 self._observer_uninstall_listener(device_id, key)
                 if len(object_context[PATH_KEY]) > 0:
                     object_context[PATH_KEY] = []
@@ -225,7 +283,9 @@ class MxDCore(object):
 
         if found_cs_references:
             TupleWrapper.forget_tuple_wrapper_instances()
+            self._path_cache.clear()
             self.appointed_lom_ids = {0: None}
+            self._appointed_lom_ids_by_object = {None: 0}
         return
 
     def path_set_path(self, device_id, object_id, parameters):
@@ -731,14 +791,17 @@ class MxDCore(object):
 
     def update_observer_listener(self, device_id, object_id):
         self.update_device_context(device_id, object_id)
+        self._update_lom_id_index(device_id, object_id)
         self._observer_update_listener(device_id, object_id)
 
     def install_observer_listener(self, device_id, object_id):
         self.update_device_context(device_id, object_id)
+        self._update_lom_id_index(device_id, object_id)
         self._observer_install_listener(device_id, object_id)
 
     def uninstall_observer_listener(self, device_id, object_id):
         self.update_device_context(device_id, object_id)
+        self._update_lom_id_index(device_id, object_id)
         self._observer_uninstall_listener(device_id, object_id)
 
     def update_lom_id_observers_and_remotes(self, lom_id):
@@ -841,6 +904,7 @@ class MxDCore(object):
 
     def update_remote_timeable(self, device_id, object_id):
         self.update_device_context(device_id, object_id)
+        self._update_lom_id_index(device_id, object_id)
         self._remote_update_timeable(device_id, object_id, False)
 
     def reset_all_current_lom_ids(self, device_id):